@@ -1,26 +1,163 @@
 import dash
-from dash import dcc, html, Input, Output, State, callback_context, no_update
+from dash import dcc, html, Input, Output, State, ClientsideFunction, callback_context, no_update
 import dash_bootstrap_components as dbc
+import flask
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import plotly.graph_objects as go
-import plotly.express as px
+from plotly.colors import sequential as sequential_colors
 import numpy as np
-import torch
-import torch.nn as nn
-import torch.optim as optim
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import mean_squared_error
 import os
-import json
+import tempfile
+import orjson
 from datetime import datetime
 import hashlib
+import hmac
+import copy
+import functools
+import time
+import threading
+import warnings
 
-# Daten laden
+# Load data
 current_dir = os.path.dirname(os.path.abspath(__file__))
 csv_path = os.path.join(current_dir, 'deutsche_bank_costs.csv')
-df = pd.read_csv(csv_path)
+parquet_path = csv_path.replace('.csv', '.parquet')
+
+# Filterable hierarchy levels (Level1 is the single bank root above them)
+CATEGORY_COLUMNS = ['Level2', 'Level3', 'Level4', 'Level5']
+# All hierarchy columns are stored as categoricals in the Parquet copy
+HIERARCHY_COLUMNS = ['Level1'] + CATEGORY_COLUMNS
+LEVEL_DTYPE = pd.CategoricalDtype(ordered=False)
+
+# Stored in the Parquet schema metadata; bump it whenever the converted columns or types change
+PARQUET_SCHEMA_VERSION = b'2'
+
+# Explicit column types so read_csv skips dtype inference
+CSV_DTYPES = {
+    **{col: LEVEL_DTYPE for col in HIERARCHY_COLUMNS},
+    'Cost': 'int64'
+}
+
+# Process umask, read once at import (os.umask can only be queried by setting it)
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+def convert_csv_to_parquet(source_path, target_path, chunksize=1_000_000):
+    """Convert the cost CSV into a compact, typed Parquet file"""
+    chunks = pd.read_csv(source_path, dtype=CSV_DTYPES, usecols=list(CSV_DTYPES),
+                         engine='c', na_filter=False, low_memory=False, chunksize=chunksize)
+    df_parquet = pd.concat(chunks, ignore_index=True)
+    
+    # Downcast numerics and store the low-cardinality hierarchy as categories
+    df_parquet['Cost'] = pd.to_numeric(df_parquet['Cost'], downcast='integer')
+    for col in HIERARCHY_COLUMNS:
+        # Chunks with differing categories concatenate to object, so re-categorize
+        df_parquet[col] = df_parquet[col].astype(LEVEL_DTYPE)
+    
+    table = pa.Table.from_pandas(df_parquet, preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata, b'schema_version': PARQUET_SCHEMA_VERSION})
+    
+    # Written to a private temp file next to the target and swapped in atomically, so a crash
+    # or a concurrent worker never leaves a truncated copy behind
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target_path),
+                                    prefix=os.path.basename(target_path) + '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path, compression='zstd')
+        # mkstemp creates the file 0600, give it the permissions a plain open() would have
+        os.chmod(tmp_path, 0o666 & ~UMASK)
+        os.replace(tmp_path, target_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def parquet_is_current():
+    """True if the Parquet copy exists, is not older than the CSV and has the current schema"""
+    if not os.path.exists(parquet_path) or os.path.getmtime(parquet_path) < os.path.getmtime(csv_path):
+        return False
+    return (pq.read_schema(parquet_path).metadata or {}).get(b'schema_version') == PARQUET_SCHEMA_VERSION
+
+def load_cost_data():
+    """Load the cost data, refreshing the Parquet copy whenever the CSV is newer or the schema changed"""
+    if not parquet_is_current():
+        convert_csv_to_parquet(csv_path, parquet_path)
+    return pd.read_parquet(parquet_path)
+
+df = load_cost_data()
+LEVEL2_CATS = df['Level2'].cat.categories.tolist()
+
+# Row positions of df on the sorted filter hierarchy (Level2 -> Level5)
+df_positions = pd.Series(
+    np.arange(len(df)),
+    index=pd.MultiIndex.from_frame(df[CATEGORY_COLUMNS])
+).sort_index()
+
+# Row positions per Region for the common "Level2 only" filter
+LEVEL2_ROWS = df.groupby('Level2', observed=True).indices
+NO_ROWS = np.empty(0, dtype=np.intp)
+
+def filter_key(values):
+    """Normalize a filter dropdown value into a hashable tuple (None = no filter)"""
+    if not values or values == 'ALL' or 'ALL' in values:
+        return None
+    if isinstance(values, str):
+        return (values,)
+    return tuple(sorted(values))
+
+@functools.lru_cache(maxsize=256)
+def get_slice(level2=None, level3=None, level4=None, level5=None):
+    """Rows of df matching the filter tuples, looked up on the sorted MultiIndex.
+    
+    The returned frame is shared between callers and must not be mutated.
+    """
+    filters = (level2, level3, level4, level5)
+    if all(values is None for values in filters):
+        return df
+    
+    if all(values is None for values in filters[1:]):
+        positions = np.concatenate([LEVEL2_ROWS.get(value, NO_ROWS) for value in level2])
+        return df.iloc[np.sort(positions)]
+    
+    idx = tuple(slice(None) if values is None else list(values) for values in filters)
+    try:
+        positions = df_positions.loc[idx].to_numpy()
+    except KeyError:
+        # Labels that share no rows, e.g. a Level3 left over from the previous Level2 selection
+        return df.iloc[:0]
+    return df.iloc[np.sort(positions)]
+
+# Average cost per exact Level2-Level5 combination, shown next to predictions
+GROUP_MEAN_COST = df.groupby(CATEGORY_COLUMNS, observed=True)['Cost'].mean().to_dict()
+
+# Filter dropdown options, computed once at import
+LEVEL2_OPTIONS = [{'label': 'All', 'value': 'ALL'}] + [{'label': v, 'value': v} for v in LEVEL2_CATS]
+
+# Sorted values of every hierarchy level, so option lists are pruned instead of re-sorted
+LEVEL_ORDER = {level: sorted(df[level].cat.categories) for level in CATEGORY_COLUMNS}
+
+# Plain dropdown options of the ML prediction forms, defaulting to each level's first row value
+LEVEL_OPTIONS = {level: [{'label': v, 'value': v} for v in LEVEL_ORDER[level]] for level in CATEGORY_COLUMNS}
+LEVEL_DEFAULTS = {level: df[level].iloc[0] for level in CATEGORY_COLUMNS}
+
+def level_options(df_filtered, level):
+    """Dropdown options for one hierarchy level of the filtered data"""
+    present = set(df_filtered[level].unique())
+    return [{'label': 'Alle', 'value': 'ALL'}] + \
+           [{'label': i, 'value': i} for i in LEVEL_ORDER[level] if i in present]
+
+# Cascading options for the unfiltered table and for every single Level2 selection
+CASCADE_OPTIONS = {
+    level2: {level: level_options(get_slice(level2), level) for level in CATEGORY_COLUMNS[1:]}
+    for level2 in [None] + [(v,) for v in LEVEL2_CATS]
+}
+
+def cascade_options(level, level2, *lower_filters):
+    """Options for a cascading filter, served from CASCADE_OPTIONS when possible"""
+    if level2 in CASCADE_OPTIONS and all(values is None for values in lower_filters):
+        return CASCADE_OPTIONS[level2][level]
+    return level_options(get_slice(level2, *lower_filters), level)
 
 # User data storage (in production, use a database)
 USERS_FILE = os.path.join(current_dir, 'users.json')
@@ -29,80 +166,169 @@ USERS_FILE = os.path.join(current_dir, 'users.json')
 MODELS_DIR = os.path.join(current_dir, 'models')
 os.makedirs(MODELS_DIR, exist_ok=True)
 
-# PyTorch Neural Network Models
-class SmallCostPredictor(nn.Module):
-    """Small neural network for cost prediction"""
-    def __init__(self, input_size):
-        super(SmallCostPredictor, self).__init__()
-        self.fc1 = nn.Linear(input_size, 32)
-        self.fc2 = nn.Linear(32, 16)
-        self.fc3 = nn.Linear(16, 1)
-        self.relu = nn.ReLU()
-        self.dropout = nn.Dropout(0.2)
-        
-    def forward(self, x):
-        x = self.relu(self.fc1(x))
-        x = self.dropout(x)
-        x = self.relu(self.fc2(x))
-        x = self.fc3(x)
-        return x
-
-class BigCostPredictor(nn.Module):
-    """Large neural network for cost prediction"""
-    def __init__(self, input_size):
-        super(BigCostPredictor, self).__init__()
-        self.fc1 = nn.Linear(input_size, 128)
-        self.fc2 = nn.Linear(128, 64)
-        self.fc3 = nn.Linear(64, 32)
-        self.fc4 = nn.Linear(32, 16)
-        self.fc5 = nn.Linear(16, 1)
-        self.relu = nn.ReLU()
-        self.dropout = nn.Dropout(0.3)
-        
-    def forward(self, x):
-        x = self.relu(self.fc1(x))
-        x = self.dropout(x)
-        x = self.relu(self.fc2(x))
-        x = self.dropout(x)
-        x = self.relu(self.fc3(x))
-        x = self.dropout(x)
-        x = self.relu(self.fc4(x))
-        x = self.fc5(x)
-        return x
+# Training mini-batch size
+TRAIN_BATCH_SIZE = 256
+# Epochs queued per fused training block before its losses are read back
+FUSED_EPOCHS = 10
 
 # Global model storage
 trained_models = {
-    'small': {'model': None, 'scaler': None, 'encoders': None, 'trained': False},
-    'big': {'model': None, 'scaler': None, 'encoders': None, 'trained': False}
+    'small': {'model': None, 'scaler': None, 'encoders': None, 'trained': False, 'fit': None},
+    'big': {'model': None, 'scaler': None, 'encoders': None, 'trained': False, 'fit': None}
 }
 
+# Bumped whenever the networks or their saved state change; older checkpoints are retrained
+CHECKPOINT_VERSION = 1
+
+def model_paths(model_type):
+    """Paths of the saved model weights and its preprocessing state"""
+    return (os.path.join(MODELS_DIR, f'{model_type}.safetensors'),
+            os.path.join(MODELS_DIR, f'{model_type}.json'))
+
+def save_trained_model(model_type, model, vocab_sizes):
+    """Persist a trained model so later runs can skip retraining"""
+    import cost_models
+    weights_path, state_path = model_paths(model_type)
+    entry = trained_models[model_type]
+    cost_models.save_weights(model, weights_path)
+    # Plain JSON (no pickle): target scaling and the labels of every level in code order
+    mean, inv_scale = entry['scaler']
+    state = {
+        'version': CHECKPOINT_VERSION,
+        'scaler': {'mean': mean.tolist(), 'inv_scale': inv_scale.tolist()},
+        'vocabularies': {col: sorted(labels, key=labels.get) for col, labels in entry['encoders'].items()}
+    }
+    tmp_path = state_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(state, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, state_path)
+
+def is_trained(model_type):
+    """Check if a model is available, lazily loading it from MODELS_DIR on first use"""
+    entry = trained_models[model_type]
+    if not entry['trained']:
+        weights_path, state_path = model_paths(model_type)
+        if os.path.exists(weights_path) and os.path.exists(state_path):
+            with open(state_path, 'rb') as f:
+                state = orjson.loads(f.read())
+            if state['version'] == CHECKPOINT_VERSION:
+                import cost_models
+                vocabularies = state['vocabularies']
+                vocab_sizes = tuple(len(vocabularies[col]) for col in CATEGORY_COLUMNS)
+                model = cost_models.load_model(model_type, vocab_sizes, weights_path)
+                entry['model'] = cost_models.build_predictor(model)
+                entry['scaler'] = (np.array(state['scaler']['mean'], dtype=np.float32),
+                                   np.array(state['scaler']['inv_scale'], dtype=np.float32))
+                entry['encoders'] = {col: {label: idx for idx, label in enumerate(labels)}
+                                     for col, labels in vocabularies.items()}
+                entry['trained'] = True
+    return entry['trained']
+
+# Fallback "member since" text for user records without a creation date
+SERVER_START_DISPLAY = datetime.now().strftime('%B %Y')
+
+def format_member_since(created_at):
+    """Format an ISO creation timestamp for the profile page, None if it is missing or malformed"""
+    try:
+        return datetime.fromisoformat(created_at).strftime('%B %Y')
+    except (TypeError, ValueError):
+        return None
+
 def load_users():
-    """Load users from JSON file"""
+    """Load users from JSON file as (usable users, unusable records)
+    
+    Records that cannot be used are returned separately so save_users can write
+    them back unchanged; the second item is None if the file itself is unreadable.
+    """
     if os.path.exists(USERS_FILE):
-        with open(USERS_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+        with open(USERS_FILE, 'rb') as f:
+            try:
+                users = orjson.loads(f.read())
+            except orjson.JSONDecodeError as e:
+                warnings.warn(f"{USERS_FILE} is not valid JSON ({e}), no users loaded")
+                return {}, None
+        if not isinstance(users, dict):
+            warnings.warn(f"{USERS_FILE} does not hold a user mapping, no users loaded")
+            return {}, None
+        valid_users = {}
+        unusable_users = {}
+        for username, user in users.items():
+            # A record needs a password hash to log in with
+            if not isinstance(user, dict) or not isinstance(user.get('password'), str):
+                unusable_users[username] = user
+                continue
+            # Older records only carry the ISO timestamp, so format it once here;
+            # without a usable one the profile shows SERVER_START_DISPLAY
+            if 'created_at_display' not in user:
+                member_since = format_member_since(user.get('created_at'))
+                if member_since is not None:
+                    user['created_at_display'] = member_since
+            valid_users[username] = user
+        if unusable_users:
+            warnings.warn(f"Skipped unusable user records in {USERS_FILE}: {', '.join(map(str, unusable_users))}")
+        return valid_users, unusable_users
+    return {}, {}
 
 def save_users(users):
-    """Save users to JSON file"""
-    with open(USERS_FILE, 'w') as f:
-        json.dump(users, f, indent=2)
+    """Save users to JSON file atomically, keeping UNUSABLE_USERS, and refresh the in-memory USERS"""
+    global USERS_MTIME
+    with USERS_LOCK:
+        if UNUSABLE_USERS is None:
+            raise RuntimeError(f"Refusing to overwrite unreadable {USERS_FILE}")
+        tmp_path = USERS_FILE + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps({**UNUSABLE_USERS, **users}, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, USERS_FILE)
+        USERS_MTIME = os.stat(USERS_FILE).st_mtime
+        if users is not USERS:
+            USERS.clear()
+            USERS.update(users)
+
+def users_mtime():
+    """Modification time of the users file, or None if it does not exist"""
+    try:
+        return os.stat(USERS_FILE).st_mtime
+    except FileNotFoundError:
+        return None
+
+def current_users():
+    """In-memory USERS, re-read only when the users file was changed outside save_users"""
+    global USERS_MTIME, UNUSABLE_USERS
+    mtime = users_mtime()
+    if mtime is not None and mtime != USERS_MTIME:
+        with USERS_LOCK:
+            users, UNUSABLE_USERS = load_users()
+            USERS.clear()
+            USERS.update(users)
+            USERS_MTIME = mtime
+    return USERS
 
 def hash_password(password):
     """Simple password hashing"""
     return hashlib.sha256(password.encode()).hexdigest()
 
-# Initialize default users if file doesn't exist
-users = load_users()
-if not users:
-    users = {
+def verify_password(password, stored_hash):
+    """Check a password against its stored hash in constant time"""
+    return hmac.compare_digest(hash_password(password), stored_hash)
+
+# In-memory user store, read at startup and written back by save_users
+# together with the records it could not use
+USERS_LOCK = threading.Lock()
+USERS_MTIME = users_mtime()
+USERS, UNUSABLE_USERS = load_users()
+
+# Initialize default users if file doesn't exist or holds no records
+if not USERS and UNUSABLE_USERS == {}:
+    created_at = datetime.now()
+    USERS.update({
         'admin': {
             'password': hash_password('admin123'),
             'email': 'admin@deutschebank.com',
             'full_name': 'Administrator',
             'department': 'IT',
             'role': 'Admin',
-            'created_at': datetime.now().isoformat()
+            'created_at': created_at.isoformat(),
+            'created_at_display': created_at.strftime('%B %Y')
         },
         'user': {
             'password': hash_password('user123'),
@@ -110,303 +336,24 @@ if not users:
             'full_name': 'John Doe',
             'department': 'Finance',
             'role': 'Analyst',
-            'created_at': datetime.now().isoformat()
+            'created_at': created_at.isoformat(),
+            'created_at_display': created_at.strftime('%B %Y')
         }
-    }
-    save_users(users)
+    })
+    save_users(USERS)
 
 # Dash App initialisieren
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], suppress_callback_exceptions=True)
 app.title = "Deutsche Bank Cost Dashboard"
 
-# Enhanced CSS and JavaScript
-app.index_string = '''
-<!DOCTYPE html>
-<html>
-    <head>
-        {%metas%}
-        <title>{%title%}</title>
-        {%favicon%}
-        {%css%}
-        <script src="https://cdn.jsdelivr.net/npm/sortablejs@1.15.0/Sortable.min.js"></script>
-        <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-        <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css">
-        <style>
-            * {
-                font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            }
-            .draggable-container {
-                min-height: 100px;
-            }
-            .draggable-item {
-                transition: transform 0.2s, box-shadow 0.2s;
-            }
-            .draggable-item:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 4px 16px rgba(0, 24, 168, 0.15) !important;
-            }
-            .draggable-item:hover .drag-handle {
-                background-color: #0018A8 !important;
-                color: white !important;
-            }
-            .drag-handle {
-                cursor: move !important;
-            }
-            .ghost {
-                opacity: 0.3;
-            }
-            .section-title {
-                color: #0018A8;
-                font-weight: 600;
-                font-size: 1.1rem;
-                margin: 15px 0 10px 0;
-                padding-left: 12px;
-                border-left: 4px solid #0018A8;
-            }
-            .login-container {
-                min-height: 100vh;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                background: linear-gradient(135deg, #0018A8 0%, #5a6c7d 100%);
-            }
-            .login-card {
-                background: white;
-                border-radius: 16px;
-                box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
-                padding: 40px;
-                max-width: 450px;
-                width: 100%;
-            }
-            .profile-card {
-                background: white;
-                border-radius: 12px;
-                box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
-                padding: 30px;
-                margin-bottom: 20px;
-            }
-            .navbar-custom {
-                background: #5a6c7d;
-                box-shadow: 0 2px 10px rgba(0, 0, 0, 0.1);
-                padding: 15px 0;
-            }
-            .nav-link-custom {
-                color: white !important;
-                font-weight: 500;
-                margin: 0 10px;
-                transition: all 0.3s;
-            }
-            .nav-link-custom:hover {
-                color: #e8e8e8 !important;
-                transform: translateY(-2px);
-            }
-            .btn-primary-custom {
-                background: linear-gradient(135deg, #0018A8 0%, #003d82 100%);
-                border: none;
-                border-radius: 8px;
-                padding: 12px 30px;
-                font-weight: 600;
-                transition: all 0.3s;
-            }
-            .btn-primary-custom:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 4px 12px rgba(0, 24, 168, 0.3);
-            }
-            .user-avatar {
-                width: 80px;
-                height: 80px;
-                border-radius: 50%;
-                background: linear-gradient(135deg, #0018A8 0%, #5a6c7d 100%);
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                color: white;
-                font-size: 32px;
-                font-weight: 700;
-                margin: 0 auto 20px;
-            }
-            .ai-panel-card {
-                background: white;
-                border-radius: 12px;
-                box-shadow: 0 4px 20px rgba(0, 24, 168, 0.15);
-                padding: 30px;
-                margin-bottom: 20px;
-                border: 2px solid #0018A8;
-            }
-            .model-card {
-                background: #f8f9fa;
-                border-radius: 10px;
-                padding: 20px;
-                margin: 15px 0;
-                border: 2px solid #E5E5E5;
-                transition: all 0.3s;
-            }
-            .model-card:hover {
-                border-color: #0018A8;
-                box-shadow: 0 4px 12px rgba(0, 24, 168, 0.2);
-            }
-            .prediction-result {
-                background: #0018A8;
-                color: white;
-                border-radius: 10px;
-                padding: 20px;
-                margin: 20px 0;
-                text-align: center;
-            }
-        </style>
-    </head>
-    <body>
-        {%app_entry%}
-        <footer>
-            {%config%}
-            {%scripts%}
-            {%renderer%}
-        </footer>
-        <script>
-            document.addEventListener('DOMContentLoaded', function() {
-                setTimeout(function() {
-                    var containers = document.querySelectorAll('.draggable-container');
-                    containers.forEach(function(container) {
-                        if (container && !container.sortableInitialized) {
-                            Sortable.create(container, {
-                                animation: 150,
-                                handle: '.drag-handle',
-                                ghostClass: 'ghost',
-                                dragClass: 'dragging',
-                                direction: 'vertical'
-                            });
-                            container.sortableInitialized = true;
-                        }
-                    });
-                }, 1000);
-            });
-        </script>
-    </body>
-</html>
-'''
-
-# Custom Styles
-custom_style = {
-    'backgroundColor': '#F4F4F4',
-    'fontFamily': '"Inter", -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif'
-}
-
-card_style = {
-    'boxShadow': '0 2px 8px rgba(0, 24, 168, 0.08)',
-    'borderRadius': '8px',
-    'backgroundColor': 'white',
-    'padding': '24px',
-    'marginBottom': '24px',
-    'border': '1px solid #E5E5E5'
-}
-
-header_style = {
-    'backgroundColor': 'white',
-    'borderBottom': '3px solid #0018A8',
-    'boxShadow': '0 2px 4px rgba(0, 0, 0, 0.1)',
-    'marginBottom': '30px',
-    'padding': '20px 0'
-}
-
-draggable_item_style = {
-    'boxShadow': '0 2px 8px rgba(0, 24, 168, 0.08)',
-    'borderRadius': '8px',
-    'backgroundColor': 'white',
-    'padding': '24px',
-    'marginBottom': '24px',
-    'border': '1px solid #E5E5E5',
-    'cursor': 'move',
-    'position': 'relative'
-}
-
-hero_chart_style = {
-    'boxShadow': '0 2px 8px rgba(0, 24, 168, 0.1)',
-    'borderRadius': '8px',
-    'backgroundColor': 'white',
-    'padding': '15px',
-    'marginBottom': '20px',
-    'border': '1px solid #0018A8',
-    'cursor': 'move',
-    'position': 'relative',
-    'display': 'block',
-    'width': '100%'
-}
-
-medium_chart_style = {
-    'boxShadow': '0 2px 6px rgba(0, 24, 168, 0.08)',
-    'borderRadius': '8px',
-    'backgroundColor': 'white',
-    'padding': '15px',
-    'marginBottom': '20px',
-    'border': '1px solid #E5E5E5',
-    'cursor': 'move',
-    'position': 'relative',
-    'display': 'block',
-    'width': '100%'
-}
-
-small_chart_style = {
-    'boxShadow': '0 2px 4px rgba(0, 24, 168, 0.06)',
-    'borderRadius': '8px',
-    'backgroundColor': 'white',
-    'padding': '15px',
-    'marginBottom': '20px',
-    'border': '1px solid #E5E5E5',
-    'cursor': 'move',
-    'position': 'relative',
-    'display': 'block',
-    'width': '100%'
-}
-
-half_width_style = {
-    'boxShadow': '0 2px 6px rgba(0, 24, 168, 0.08)',
-    'borderRadius': '8px',
-    'backgroundColor': 'white',
-    'padding': '15px',
-    'marginBottom': '20px',
-    'border': '1px solid #E5E5E5',
-    'cursor': 'move',
-    'position': 'relative',
-    'display': 'block',
-    'width': '100%'
-}
-
-kpi_style = {
-    'boxShadow': '0 2px 8px rgba(0, 24, 168, 0.08)',
-    'borderRadius': '8px',
-    'backgroundColor': 'white',
-    'padding': '12px',
-    'marginBottom': '16px',
-    'border': '1px solid #E5E5E5',
-    'cursor': 'move',
-    'position': 'relative'
-}
-
-drag_handle_style = {
-    'position': 'absolute',
-    'top': '10px',
-    'right': '10px',
-    'cursor': 'move',
-    'color': '#0018A8',
-    'fontSize': '22px',
-    'padding': '6px 10px',
-    'backgroundColor': '#f8f9fa',
-    'borderRadius': '4px',
-    'userSelect': 'none',
-    'fontWeight': 'bold',
-    'border': '1px solid #E5E5E5',
-    'transition': 'all 0.2s'
-}
-
-section_divider_style = {
-    'height': '2px',
-    'background': 'linear-gradient(to right, #0018A8, #00BFFF, #0018A8)',
-    'margin': '20px 0 15px 0',
-    'borderRadius': '2px',
-    'opacity': '0.3'
-}
+# Enhanced HTML template and JavaScript (the stylesheet is served from assets/custom.css)
+with open(os.path.join(current_dir, 'templates', 'index.html'), 'rb') as f:
+    INDEX_BYTES = f.read()
+app.index_string = INDEX_BYTES.decode('utf-8')
 
 # Navigation Bar Component
+# Dash component trees are only serialized, never mutated, so cached instances are safe to reuse
+@functools.lru_cache(maxsize=128)
 def create_navbar(username):
     return dbc.Navbar(
         dbc.Container([
@@ -442,6 +389,7 @@ def create_navbar(username):
     )
 
 # Login Page
+@functools.lru_cache(maxsize=1)
 def create_login_page():
     return html.Div([
         dcc.Location(id='url-login', refresh=True),
@@ -475,8 +423,7 @@ def create_login_page():
 
 # User Profile Page
 def create_profile_page(username):
-    users = load_users()
-    user_data = users.get(username, {})
+    user_data = current_users().get(username, {})
     
     return html.Div([
         dcc.Location(id='url-profile', refresh=True),
@@ -535,7 +482,7 @@ def create_profile_page(username):
                                 ], style={'marginBottom': '10px'}),
                                 html.P([
                                     html.Strong("Member since: "), 
-                                    datetime.fromisoformat(user_data.get('created_at', datetime.now().isoformat())).strftime('%B %Y')
+                                    user_data.get('created_at_display', SERVER_START_DISPLAY)
                                 ], style={'marginBottom': '10px'}),
                                 html.P([
                                     html.Strong("Last login: "), 
@@ -547,12 +494,17 @@ def create_profile_page(username):
                 ], width=8, style={'margin': '0 auto'})
             ])
         ], fluid=True, style={'paddingTop': '30px', 'paddingBottom': '50px'})
-    ], style=custom_style)
+    ], className="page-background")
+
+# Empty, axis-free figure the dashboard graphs show until their callback has delivered
+PLACEHOLDER_FIGURE = {'data': [], 'layout': {'xaxis': {'visible': False}, 'yaxis': {'visible': False}}}
 
 # Dashboard Page
 def create_dashboard_page(username):
     return html.Div([
         dcc.Location(id='url-dashboard', refresh=True),
+        dcc.Store(id='filter-store'),
+        dcc.Store(id='kpi-store'),
         create_navbar(username),
         dbc.Container([
             html.Div([
@@ -568,8 +520,7 @@ def create_dashboard_page(username):
                                     html.Label("Level 2 - Region:", style={'fontWeight': 'bold'}),
                                     dcc.Dropdown(
                                         id='filter-level2',
-                                        options=[{'label': 'All', 'value': 'ALL'}] + 
-                                                [{'label': i, 'value': i} for i in sorted(df['Level2'].unique())],
+                                        options=LEVEL2_OPTIONS,
                                         value='ALL',
                                         multi=True,
                                         className="mb-2"
@@ -609,7 +560,7 @@ def create_dashboard_page(username):
                                     ),
                                 ], width=3),
                             ])
-                        ], style=card_style)
+                        ], className="filter-card")
                     ])
                 ], className="mb-4"),
                 
@@ -620,56 +571,64 @@ def create_dashboard_page(username):
                     
                     # KPI Cards (Draggable as a group)
                     html.Div([
-                        html.Div("⋮⋮", className="drag-handle", style=drag_handle_style),
+                        html.Div("⋮⋮", className="drag-handle"),
                         dbc.Row([
                             dbc.Col([
                                 html.Div([
-                                    html.Div(id='total-cost-display', 
-                                            className="text-center",
-                                            style={'fontSize': '20px', 'fontWeight': 'bold', 'color': '#0018A8'})
+                                    html.Div([
+                                        html.P("Gesamtkosten", className="mb-1", style={'fontSize': '12px', 'color': '#666'}),
+                                        html.P(html.Span(id='kpi-total'))
+                                    ], id='total-cost-display', className="text-center",
+                                       style={'fontSize': '20px', 'fontWeight': 'bold', 'color': '#0018A8'})
                                 ], style={'padding': '10px', 'background': 'linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%)', 'borderRadius': '6px'})
                             ], width=3),
                             dbc.Col([
                                 html.Div([
-                                    html.Div(id='region-count',
-                                            className="text-center",
-                                            style={'fontSize': '20px', 'fontWeight': 'bold', 'color': '#00BFFF'})
+                                    html.Div([
+                                        html.P("Regionen", className="mb-1", style={'fontSize': '12px', 'color': '#666'}),
+                                        html.P(html.Span(id='kpi-regions'))
+                                    ], id='region-count', className="text-center",
+                                       style={'fontSize': '20px', 'fontWeight': 'bold', 'color': '#00BFFF'})
                                 ], style={'padding': '10px', 'background': 'linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%)', 'borderRadius': '6px'})
                             ], width=3),
                             dbc.Col([
                                 html.Div([
-                                    html.Div(id='division-count',
-                                            className="text-center",
-                                            style={'fontSize': '20px', 'fontWeight': 'bold', 'color': '#4169E1'})
+                                    html.Div([
+                                        html.P("Divisionen", className="mb-1", style={'fontSize': '12px', 'color': '#666'}),
+                                        html.P(html.Span(id='kpi-divisions'))
+                                    ], id='division-count', className="text-center",
+                                       style={'fontSize': '20px', 'fontWeight': 'bold', 'color': '#4169E1'})
                                 ], style={'padding': '10px', 'background': 'linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%)', 'borderRadius': '6px'})
                             ], width=3),
                             dbc.Col([
                                 html.Div([
-                                    html.Div(id='avg-cost',
-                                            className="text-center",
-                                            style={'fontSize': '20px', 'fontWeight': 'bold', 'color': '#87CEEB'})
+                                    html.Div([
+                                        html.P("Ø Kosten", className="mb-1", style={'fontSize': '12px', 'color': '#666'}),
+                                        html.P(html.Span(id='kpi-avg'))
+                                    ], id='avg-cost', className="text-center",
+                                       style={'fontSize': '20px', 'fontWeight': 'bold', 'color': '#87CEEB'})
                                 ], style={'padding': '10px', 'background': 'linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%)', 'borderRadius': '6px'})
                             ], width=3),
                         ])
-                    ], className="draggable-item", style=kpi_style),
+                    ], className="kpi-box draggable-item"),
                     
                     # Divider
-                    html.Div(style=section_divider_style),
+                    html.Div(className="section-divider"),
                     
                     # Section: Flow Analysis
                     html.H2("🔄 Flow & Hierarchy Analysis", className="section-title"),
                     
                     # Sankey Chart (Hero)
                     html.Div([
-                        html.Div("⋮⋮", className="drag-handle", style=drag_handle_style),
+                        html.Div("⋮⋮", className="drag-handle"),
                         html.H3("Sankey Diagram - Cost Flow Through Hierarchy", 
                                className="mb-2",
                                style={'color': '#0018A8', 'fontWeight': '600', 'fontSize': '1.1rem', 'borderLeft': '4px solid #0018A8', 'paddingLeft': '12px'}),
-                        dcc.Graph(id='sankey-diagram', style={'height': '550px'})
-                    ], className="draggable-item", style=hero_chart_style),
+                        dcc.Loading(dcc.Graph(id='sankey-diagram', figure=PLACEHOLDER_FIGURE, style={'height': '550px'}), type='circle', color='#0018A8')
+                    ], className="chart-hero draggable-item"),
                     
                     # Divider
-                    html.Div(style=section_divider_style),
+                    html.Div(className="section-divider"),
                     
                     # Section: Regional & Division Analysis
                     html.H2("🌍 Regional & Division Analysis", className="section-title"),
@@ -679,36 +638,36 @@ def create_dashboard_page(username):
                         dbc.Col([
                             # Region Bar Chart
                             html.Div([
-                                html.Div("⋮⋮", className="drag-handle", style=drag_handle_style),
+                                html.Div("⋮⋮", className="drag-handle"),
                                 html.H4("Costs by Region", 
                                        className="mb-2",
                                        style={'color': '#0018A8', 'fontWeight': '600', 'fontSize': '1rem', 'borderLeft': '3px solid #0018A8', 'paddingLeft': '8px'}),
-                                dcc.Graph(id='region-bar-chart', style={'height': '300px'})
-                            ], className="draggable-item", style=half_width_style),
+                                dcc.Loading(dcc.Graph(id='region-bar-chart', figure=PLACEHOLDER_FIGURE, style={'height': '300px'}), type='circle', color='#0018A8')
+                            ], className="chart-medium draggable-item"),
                         ], width=6),
                         dbc.Col([
                             # Division Pie Chart
                             html.Div([
-                                html.Div("⋮⋮", className="drag-handle", style=drag_handle_style),
+                                html.Div("⋮⋮", className="drag-handle"),
                                 html.H4("Costs by Division", 
                                        className="mb-2",
                                        style={'color': '#0018A8', 'fontWeight': '600', 'fontSize': '1rem', 'borderLeft': '3px solid #0018A8', 'paddingLeft': '8px'}),
-                                dcc.Graph(id='division-pie-chart', style={'height': '300px'})
-                            ], className="draggable-item", style=half_width_style),
+                                dcc.Loading(dcc.Graph(id='division-pie-chart', figure=PLACEHOLDER_FIGURE, style={'height': '300px'}), type='circle', color='#0018A8')
+                            ], className="chart-medium draggable-item"),
                         ], width=6),
                     ], className="mb-3"),
                     
                     # Heatmap (full width)
                     html.Div([
-                        html.Div("⋮⋮", className="drag-handle", style=drag_handle_style),
+                        html.Div("⋮⋮", className="drag-handle"),
                         html.H3("Heatmap - Costs by Region and Division", 
                                className="mb-2",
                                style={'color': '#0018A8', 'fontWeight': '600', 'fontSize': '1.1rem', 'borderLeft': '3px solid #0018A8', 'paddingLeft': '10px'}),
-                        dcc.Graph(id='heatmap-chart', style={'height': '350px'})
-                    ], className="draggable-item", style=hero_chart_style),
+                        dcc.Loading(dcc.Graph(id='heatmap-chart', figure=PLACEHOLDER_FIGURE, style={'height': '350px'}), type='circle', color='#0018A8')
+                    ], className="chart-hero draggable-item"),
                     
                     # Divider
-                    html.Div(style=section_divider_style),
+                    html.Div(className="section-divider"),
                     
                     # Section: Top Performers
                     html.H2("🏆 Top Performers", className="section-title"),
@@ -718,37 +677,37 @@ def create_dashboard_page(username):
                         dbc.Col([
                             # Top Services
                             html.Div([
-                                html.Div("⋮⋮", className="drag-handle", style=drag_handle_style),
+                                html.Div("⋮⋮", className="drag-handle"),
                                 html.H4("Top 10 Services", 
                                        className="mb-2",
                                        style={'color': '#0018A8', 'fontWeight': '600', 'fontSize': '1rem', 'borderLeft': '3px solid #0018A8', 'paddingLeft': '8px'}),
-                                dcc.Graph(id='top-services-chart', style={'height': '300px'})
-                            ], className="draggable-item", style=small_chart_style),
+                                dcc.Loading(dcc.Graph(id='top-services-chart', figure=PLACEHOLDER_FIGURE, style={'height': '300px'}), type='circle', color='#0018A8')
+                            ], className="chart-small draggable-item"),
                         ], width=4),
                         dbc.Col([
                             # Top Countries
                             html.Div([
-                                html.Div("⋮⋮", className="drag-handle", style=drag_handle_style),
+                                html.Div("⋮⋮", className="drag-handle"),
                                 html.H4("Top 10 Countries", 
                                        className="mb-2",
                                        style={'color': '#0018A8', 'fontWeight': '600', 'fontSize': '1rem', 'borderLeft': '3px solid #0018A8', 'paddingLeft': '8px'}),
-                                dcc.Graph(id='top-countries-chart', style={'height': '300px'})
-                            ], className="draggable-item", style=small_chart_style),
+                                dcc.Loading(dcc.Graph(id='top-countries-chart', figure=PLACEHOLDER_FIGURE, style={'height': '300px'}), type='circle', color='#0018A8')
+                            ], className="chart-small draggable-item"),
                         ], width=4),
                         dbc.Col([
                             # Service Type Donut
                             html.Div([
-                                html.Div("⋮⋮", className="drag-handle", style=drag_handle_style),
+                                html.Div("⋮⋮", className="drag-handle"),
                                 html.H4("Costs by Service Type", 
                                        className="mb-2",
                                        style={'color': '#0018A8', 'fontWeight': '600', 'fontSize': '1rem', 'borderLeft': '3px solid #0018A8', 'paddingLeft': '8px'}),
-                                dcc.Graph(id='service-type-donut', style={'height': '300px'})
-                            ], className="draggable-item", style=small_chart_style),
+                                dcc.Loading(dcc.Graph(id='service-type-donut', figure=PLACEHOLDER_FIGURE, style={'height': '300px'}), type='circle', color='#0018A8')
+                            ], className="chart-small draggable-item"),
                         ], width=4),
                     ], className="mb-3"),
                     
                     # Divider
-                    html.Div(style=section_divider_style),
+                    html.Div(className="section-divider"),
                     
                     # Section: Statistical Analysis
                     html.H2("📈 Statistical Analysis", className="section-title"),
@@ -758,27 +717,27 @@ def create_dashboard_page(username):
                         dbc.Col([
                             # Cumulative Chart
                             html.Div([
-                                html.Div("⋮⋮", className="drag-handle", style=drag_handle_style),
+                                html.Div("⋮⋮", className="drag-handle"),
                                 html.H4("Cumulative Cost Distribution", 
                                        className="mb-2",
                                        style={'color': '#0018A8', 'fontWeight': '600', 'fontSize': '1rem', 'borderLeft': '3px solid #0018A8', 'paddingLeft': '8px'}),
-                                dcc.Graph(id='cumulative-chart', style={'height': '300px'})
-                            ], className="draggable-item", style=medium_chart_style),
+                                dcc.Loading(dcc.Graph(id='cumulative-chart', figure=PLACEHOLDER_FIGURE, style={'height': '300px'}), type='circle', color='#0018A8')
+                            ], className="chart-medium draggable-item"),
                         ], width=6),
                         dbc.Col([
                             # Box Plot
                             html.Div([
-                                html.Div("⋮⋮", className="drag-handle", style=drag_handle_style),
+                                html.Div("⋮⋮", className="drag-handle"),
                                 html.H4("Cost Distribution - Box Plot", 
                                        className="mb-2",
                                        style={'color': '#0018A8', 'fontWeight': '600', 'fontSize': '1rem', 'borderLeft': '3px solid #0018A8', 'paddingLeft': '8px'}),
-                                dcc.Graph(id='box-plot-chart', style={'height': '300px'})
-                            ], className="draggable-item", style=medium_chart_style),
+                                dcc.Loading(dcc.Graph(id='box-plot-chart', figure=PLACEHOLDER_FIGURE, style={'height': '300px'}), type='circle', color='#0018A8')
+                            ], className="chart-medium draggable-item"),
                         ], width=6),
                     ], className="mb-3"),
                     
                     # Divider
-                    html.Div(style=section_divider_style),
+                    html.Div(className="section-divider"),
                     
                     # Section: Advanced Visualizations
                     html.H2("🎯 Advanced Visualizations", className="section-title"),
@@ -788,28 +747,28 @@ def create_dashboard_page(username):
                         dbc.Col([
                             # Sunburst
                             html.Div([
-                                html.Div("⋮⋮", className="drag-handle", style=drag_handle_style),
+                                html.Div("⋮⋮", className="drag-handle"),
                                 html.H4("Sunburst - Hierarchical Cost Breakdown", 
                                        className="mb-2",
                                        style={'color': '#0018A8', 'fontWeight': '600', 'fontSize': '1rem', 'borderLeft': '3px solid #0018A8', 'paddingLeft': '8px'}),
-                                dcc.Graph(id='sunburst-chart', style={'height': '350px'})
-                            ], className="draggable-item", style=medium_chart_style),
+                                dcc.Loading(dcc.Graph(id='sunburst-chart', figure=PLACEHOLDER_FIGURE, style={'height': '350px'}), type='circle', color='#0018A8')
+                            ], className="chart-medium draggable-item"),
                         ], width=6),
                         dbc.Col([
                             # Radar Chart
                             html.Div([
-                                html.Div("⋮⋮", className="drag-handle", style=drag_handle_style),
+                                html.Div("⋮⋮", className="drag-handle"),
                                 html.H4("Regional Cost Categories - Radar", 
                                        className="mb-2",
                                        style={'color': '#0018A8', 'fontWeight': '600', 'fontSize': '1rem', 'borderLeft': '3px solid #0018A8', 'paddingLeft': '8px'}),
-                                dcc.Graph(id='radar-chart', style={'height': '350px'})
-                            ], className="draggable-item", style=medium_chart_style),
+                                dcc.Loading(dcc.Graph(id='radar-chart', figure=PLACEHOLDER_FIGURE, style={'height': '350px'}), type='circle', color='#0018A8')
+                            ], className="chart-medium draggable-item"),
                         ], width=6),
                     ], className="mb-3"),
                     
                 ], className="draggable-container"),
                 
-            ], style=custom_style)
+            ], className="page-background")
         ], fluid=True, style={'backgroundColor': '#F4F4F4', 'minHeight': '100vh'})
     ])
 
@@ -878,9 +837,9 @@ def login(n_clicks, username, password, session_data):
     if not username or not password:
         return session_data, 'Please enter both username and password', no_update
     
-    users = load_users()
+    users = current_users()
     if username in users:
-        if users[username]['password'] == hash_password(password):
+        if verify_password(password, users[username]['password']):
             new_session = {'username': username, 'authenticated': True}
             return new_session, '', '/dashboard'
     
@@ -917,18 +876,18 @@ def save_profile(n_clicks, fullname, email, department, role, session_data):
     if not username:
         return dbc.Alert("Not authenticated", color="danger")
     
-    users = load_users()
-    if username in users:
-        users[username]['full_name'] = fullname or users[username].get('full_name', '')
-        users[username]['email'] = email or users[username].get('email', '')
-        users[username]['department'] = department or users[username].get('department', '')
-        users[username]['role'] = role or users[username].get('role', '')
-        save_users(users)
+    if username in current_users():
+        user = USERS[username]
+        user['full_name'] = fullname or user.get('full_name', '')
+        user['email'] = email or user.get('email', '')
+        user['department'] = department or user.get('department', '')
+        user['role'] = role or user.get('role', '')
+        save_users(USERS)
         return dbc.Alert("Profile updated successfully!", color="success")
     
     return dbc.Alert("Error updating profile", color="danger")
 
-# Callback für kaskadierende Filter
+# Callback for the cascading filters
 @app.callback(
     [Output('filter-level3', 'options'),
      Output('filter-level4', 'options'),
@@ -938,181 +897,250 @@ def save_profile(n_clicks, fullname, email, department, role, session_data):
      Input('filter-level4', 'value')]
 )
 def update_filter_options(level2, level3, level4):
-    # Filtern für Level 3
-    if level2 and level2 != 'ALL' and 'ALL' not in level2:
-        df_filtered = df[df['Level2'].isin(level2)]
-    else:
-        df_filtered = df
-    
-    level3_options = [{'label': 'Alle', 'value': 'ALL'}] + \
-                     [{'label': i, 'value': i} for i in sorted(df_filtered['Level3'].unique())]
-    
-    # Filtern für Level 4
-    if level3 and level3 != 'ALL' and 'ALL' not in level3:
-        df_filtered = df_filtered[df_filtered['Level3'].isin(level3)]
-    
-    level4_options = [{'label': 'Alle', 'value': 'ALL'}] + \
-                     [{'label': i, 'value': i} for i in sorted(df_filtered['Level4'].unique())]
-    
-    # Filtern für Level 5
-    if level4 and level4 != 'ALL' and 'ALL' not in level4:
-        df_filtered = df_filtered[df_filtered['Level4'].isin(level4)]
+    level2, level3, level4 = filter_key(level2), filter_key(level3), filter_key(level4)
     
-    level5_options = [{'label': 'Alle', 'value': 'ALL'}] + \
-                     [{'label': i, 'value': i} for i in sorted(df_filtered['Level5'].unique())]
+    # Options for Level 3, 4 and 5
+    level3_options = cascade_options('Level3', level2)
+    level4_options = cascade_options('Level4', level2, level3)
+    level5_options = cascade_options('Level5', level2, level3, level4)
     
     return level3_options, level4_options, level5_options
 
-# Callback für Diagramme
+# Filter callback: only writes the normalized filters to filter-store,
+# the chart callbacks read it independently and run in parallel
 @app.callback(
-    [Output('sankey-diagram', 'figure'),
-     Output('total-cost-display', 'children'),
-     Output('region-count', 'children'),
-     Output('division-count', 'children'),
-     Output('avg-cost', 'children'),
-     Output('region-bar-chart', 'figure'),
-     Output('division-pie-chart', 'figure'),
-     Output('top-services-chart', 'figure'),
-     Output('top-countries-chart', 'figure'),
-     Output('service-type-donut', 'figure'),
-     Output('heatmap-chart', 'figure'),
-     Output('cumulative-chart', 'figure'),
-     Output('box-plot-chart', 'figure'),
-     Output('sunburst-chart', 'figure'),
-     Output('radar-chart', 'figure')],
+    Output('filter-store', 'data'),
     [Input('filter-level2', 'value'),
      Input('filter-level3', 'value'),
      Input('filter-level4', 'value'),
      Input('filter-level5', 'value')]
 )
-def update_graphs(level2, level3, level4, level5):
-    # Daten filtern
-    df_filtered = df.copy()
-    
-    if level2 and level2 != 'ALL' and 'ALL' not in level2:
-        df_filtered = df_filtered[df_filtered['Level2'].isin(level2)]
-    
-    if level3 and level3 != 'ALL' and 'ALL' not in level3:
-        df_filtered = df_filtered[df_filtered['Level3'].isin(level3)]
-    
-    if level4 and level4 != 'ALL' and 'ALL' not in level4:
-        df_filtered = df_filtered[df_filtered['Level4'].isin(level4)]
-    
-    if level5 and level5 != 'ALL' and 'ALL' not in level5:
-        df_filtered = df_filtered[df_filtered['Level5'].isin(level5)]
-    
-    # KPIs berechnen
-    total_cost = df_filtered['Cost'].sum()
-    region_count = df_filtered['Level2'].nunique()
-    division_count = df_filtered['Level4'].nunique()
-    avg_cost = df_filtered['Cost'].mean()
-    
-    # KPI Displays
-    cost_display = html.Div([
-        html.P("Gesamtkosten", className="mb-1", style={'fontSize': '12px', 'color': '#666'}),
-        html.P(f"€{total_cost:,.0f}".replace(',', '.'))
-    ])
-    
-    region_display = html.Div([
-        html.P("Regionen", className="mb-1", style={'fontSize': '12px', 'color': '#666'}),
-        html.P(f"{region_count}")
-    ])
-    
-    division_display = html.Div([
-        html.P("Divisionen", className="mb-1", style={'fontSize': '12px', 'color': '#666'}),
-        html.P(f"{division_count}")
-    ])
-    
-    avg_display = html.Div([
-        html.P("Ø Kosten", className="mb-1", style={'fontSize': '12px', 'color': '#666'}),
-        html.P(f"€{avg_cost:,.0f}".replace(',', '.'))
-    ])
+def update_filter_store(level2, level3, level4, level5):
+    filters = [filter_key(values) for values in (level2, level3, level4, level5)]
+    # Compute the aggregations up front so the parallel chart callbacks hit the cache
+    aggregate_slice(*filters)
+    return filters
+
+def store_filters(data):
+    """filter-store contents (JSON lists) back into the hashable filter tuples"""
+    if not data:
+        return (None, None, None, None)
+    return tuple(None if values is None else tuple(values) for values in data)
+
+# Filter combinations whose chart figures are kept per worker process. A figure's size is
+# bounded by the hierarchy's cardinality (and CUMULATIVE_MAX_POINTS), not by the row count;
+# all eleven charts of one combination take about 0.6 MiB, mostly their copies of the layout
+# template, so a full cache holds roughly 20 MiB in each worker
+FIGURE_CACHE_SIZE = 32
+
+def filter_store_figure(build):
+    """Turn a figure builder into a filter-store callback memoized per filter combination.
     
-    # Alle Diagramme erstellen
-    sankey_fig = create_sankey(df_filtered)
-    region_bar = create_region_bar(df_filtered)
-    division_pie = create_division_pie(df_filtered)
-    top_services = create_top_services(df_filtered)
-    top_countries = create_top_countries(df_filtered)
-    service_donut = create_service_donut(df_filtered)
-    heatmap = create_heatmap(df_filtered)
-    cumulative = create_cumulative(df_filtered)
-    box_plot = create_box_plot(df_filtered)
-    sunburst = create_sunburst(df_filtered)
-    radar = create_radar(df_filtered)
-    
-    return (sankey_fig, cost_display, region_display, division_display, 
-            avg_display, region_bar, division_pie, top_services, top_countries,
-            service_donut, heatmap, cumulative, box_plot, sunburst, radar)
-
-def create_sankey(df_filtered):
-    """Erstellt ein Sankey Diagramm mit allen Hierarchieebenen"""
-    
-    # Knoten und Links vorbereiten
-    all_nodes = []
-    node_dict = {}
-    links_source = []
-    links_target = []
-    links_value = []
-    links_color = []
-    
-    # Farbpalette
-    colors = ['#0018A8', '#00BFFF', '#4169E1', '#87CEEB', '#B0E0E6']
-    
-    # Level 1 -> Level 2
-    for _, row in df_filtered.groupby(['Level1', 'Level2'])['Cost'].sum().reset_index().iterrows():
-        if row['Level1'] not in node_dict:
-            node_dict[row['Level1']] = len(all_nodes)
-            all_nodes.append(row['Level1'])
-        if row['Level2'] not in node_dict:
-            node_dict[row['Level2']] = len(all_nodes)
-            all_nodes.append(row['Level2'])
-        
-        links_source.append(node_dict[row['Level1']])
-        links_target.append(node_dict[row['Level2']])
-        links_value.append(row['Cost'])
-        links_color.append('rgba(0, 24, 168, 0.3)')
-    
-    # Level 2 -> Level 3
-    for _, row in df_filtered.groupby(['Level2', 'Level3'])['Cost'].sum().reset_index().iterrows():
-        if row['Level3'] not in node_dict:
-            node_dict[row['Level3']] = len(all_nodes)
-            all_nodes.append(row['Level3'])
-        
-        links_source.append(node_dict[row['Level2']])
-        links_target.append(node_dict[row['Level3']])
-        links_value.append(row['Cost'])
-        links_color.append('rgba(0, 191, 255, 0.3)')
-    
-    # Level 3 -> Level 4
-    for _, row in df_filtered.groupby(['Level3', 'Level4'])['Cost'].sum().reset_index().iterrows():
-        if row['Level4'] not in node_dict:
-            node_dict[row['Level4']] = len(all_nodes)
-            all_nodes.append(row['Level4'])
-        
-        links_source.append(node_dict[row['Level3']])
-        links_target.append(node_dict[row['Level4']])
-        links_value.append(row['Cost'])
-        links_color.append('rgba(65, 105, 225, 0.3)')
-    
-    # Level 4 -> Level 5
-    for _, row in df_filtered.groupby(['Level4', 'Level5'])['Cost'].sum().reset_index().iterrows():
-        if row['Level5'] not in node_dict:
-            node_dict[row['Level5']] = len(all_nodes)
-            all_nodes.append(row['Level5'])
-        
-        links_source.append(node_dict[row['Level4']])
-        links_target.append(node_dict[row['Level5']])
-        links_value.append(row['Cost'])
-        links_color.append('rgba(135, 206, 235, 0.3)')
+    Figures are cached as plain dicts, so repeated filters skip building and validating them.
+    """
+    cached = functools.lru_cache(maxsize=FIGURE_CACHE_SIZE)(lambda filters: build(*filters).to_dict())
     
-    # Sankey erstellen
+    @functools.wraps(build)
+    def callback(data):
+        return cached(store_filters(data))
+    return callback
+
+@app.callback(Output('kpi-store', 'data'), Input('filter-store', 'data'))
+def update_kpis(data):
+    # KPI values, formatted clientside (assets/dashboard.js)
+    kpis = aggregate_slice(*store_filters(data))['kpis']
+    return {
+        'total': int(kpis['total']),
+        'regions': int(kpis['regions']),
+        'divisions': int(kpis['divisions']),
+        # The mean of an empty slice is NaN, which is not valid JSON
+        'avg': float(kpis['avg']) if kpis['count'] else 0.0
+    }
+
+# Chart callbacks
+@app.callback(Output('sankey-diagram', 'figure'), Input('filter-store', 'data'))
+@filter_store_figure
+def update_sankey(*filters):
+    return create_sankey(aggregate_slice(*filters))
+
+@app.callback(Output('region-bar-chart', 'figure'), Input('filter-store', 'data'))
+@filter_store_figure
+def update_region_bar(*filters):
+    return create_region_bar(aggregate_slice(*filters)['by_L2'])
+
+@app.callback(Output('division-pie-chart', 'figure'), Input('filter-store', 'data'))
+@filter_store_figure
+def update_division_pie(*filters):
+    return create_division_pie(aggregate_slice(*filters)['by_L4'])
+
+@app.callback(Output('top-services-chart', 'figure'), Input('filter-store', 'data'))
+@filter_store_figure
+def update_top_services(*filters):
+    return create_top_services(aggregate_slice(*filters)['by_L5'])
+
+@app.callback(Output('top-countries-chart', 'figure'), Input('filter-store', 'data'))
+@filter_store_figure
+def update_top_countries(*filters):
+    return create_top_countries(aggregate_slice(*filters)['by_L3'])
+
+@app.callback(Output('service-type-donut', 'figure'), Input('filter-store', 'data'))
+@filter_store_figure
+def update_service_donut(*filters):
+    return create_service_donut(aggregate_slice(*filters)['by_L5'])
+
+@app.callback(Output('heatmap-chart', 'figure'), Input('filter-store', 'data'))
+@filter_store_figure
+def update_heatmap(*filters):
+    return create_heatmap(aggregate_slice(*filters)['by_L2_L4'])
+
+@app.callback(Output('cumulative-chart', 'figure'), Input('filter-store', 'data'))
+@filter_store_figure
+def update_cumulative(*filters):
+    return create_cumulative(aggregate_slice(*filters)['sorted_costs'])
+
+@app.callback(Output('box-plot-chart', 'figure'), Input('filter-store', 'data'))
+@filter_store_figure
+def update_box_plot(*filters):
+    return create_box_plot(aggregate_slice(*filters)['box_stats'])
+
+@app.callback(Output('sunburst-chart', 'figure'), Input('filter-store', 'data'))
+@filter_store_figure
+def update_sunburst(*filters):
+    aggs = aggregate_slice(*filters)
+    return create_sunburst(aggs['by_L2_L5'], aggs['squares_L2_L5'])
+
+@app.callback(Output('radar-chart', 'figure'), Input('filter-store', 'data'))
+@filter_store_figure
+def update_radar(*filters):
+    aggs = aggregate_slice(*filters)
+    return create_radar(aggs['by_L2'], aggs['by_L4'], aggs['by_L2_L4'])
+
+# KPI texts are formatted in the browser from kpi-store
+app.clientside_callback(
+    ClientsideFunction(namespace='dashboard', function_name='formatKpis'),
+    [Output('kpi-total', 'children'),
+     Output('kpi-regions', 'children'),
+     Output('kpi-divisions', 'children'),
+     Output('kpi-avg', 'children')],
+    Input('kpi-store', 'data')
+)
+
+def compute_kpis(df_filtered):
+    """Compute all KPI values in one pass over the cost column"""
+    cost_stats = df_filtered['Cost'].agg(['sum', 'mean', 'count'])
+    return {
+        'total': cost_stats['sum'],
+        'avg': cost_stats['mean'],
+        'count': int(cost_stats['count']),
+        'regions': df_filtered['Level2'].nunique(),
+        'divisions': df_filtered['Level4'].nunique()
+    }
+
+def compute_box_stats(df_filtered):
+    """Box plot statistics per region (quartiles, Tukey whiskers, mean, standard deviation)"""
+    regions = df_filtered['Level2']
+    cost = df_filtered['Cost'].astype('float64')
+    grouped = cost.groupby(regions, observed=True)
+    
+    # reindex keeps the quartile columns when the slice is empty and unstack returns none
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack().reindex(columns=[0.25, 0.5, 0.75])
+    stats.columns = ['q1', 'median', 'q3']
+    stats['mean'] = grouped.mean()
+    stats['sd'] = grouped.std()
+    
+    # Whiskers end at the most extreme value within 1.5 IQR
+    iqr = stats['q3'] - stats['q1']
+    low = (stats['q1'] - 1.5 * iqr).reindex(regions).to_numpy()
+    high = (stats['q3'] + 1.5 * iqr).reindex(regions).to_numpy()
+    stats['lowerfence'] = cost.where(cost.to_numpy() >= low).groupby(regions, observed=True).min()
+    stats['upperfence'] = cost.where(cost.to_numpy() <= high).groupby(regions, observed=True).max()
+    return stats
+
+@functools.lru_cache(maxsize=256)
+def aggregate_slice(level2=None, level3=None, level4=None, level5=None):
+    """All aggregations of one filter combination, computed once and shared by the charts.
+    
+    The returned Series are cached and must not be mutated by the chart builders.
+    """
+    df_filtered = get_slice(level2, level3, level4, level5)
+    sorted_costs = np.sort(df_filtered['Cost'].to_numpy())[::-1]
+    sorted_costs.flags.writeable = False
+    
+    costs = df_filtered['Cost'].to_numpy()
+    
+    def level_sum(*levels):
+        return df_filtered.groupby(list(levels), observed=True)['Cost'].sum()
+    
+    def code_sum(level):
+        # Single-level sums straight from the category codes, skipping the groupby machinery
+        codes = df_filtered[level].cat.codes.to_numpy()
+        categories = df_filtered[level].cat.categories
+        sums = np.bincount(codes, weights=costs, minlength=len(categories)).astype(np.int64)
+        present = np.bincount(codes, minlength=len(categories)) > 0
+        return pd.Series(sums[present], index=pd.Index(categories[present], name=level), name='Cost')
+    
+    return {
+        'kpis': compute_kpis(df_filtered),
+        'total': df_filtered['Cost'].sum(),
+        'by_L2': code_sum('Level2'),
+        'by_L3': code_sum('Level3'),
+        'by_L4': code_sum('Level4'),
+        'by_L5': code_sum('Level5'),
+        'by_L2_L4': level_sum('Level2', 'Level4'),
+        'by_L1_L2': level_sum('Level1', 'Level2'),
+        'by_L2_L3': level_sum('Level2', 'Level3'),
+        'by_L3_L4': level_sum('Level3', 'Level4'),
+        'by_L4_L5': level_sum('Level4', 'Level5'),
+        'by_L2_L5': level_sum(*CATEGORY_COLUMNS),
+        # Sum of squared costs per path, for the sunburst's cost-weighted mean colors
+        'squares_L2_L5': (df_filtered['Cost'].astype(np.float64) ** 2)
+                         .groupby([df_filtered[col] for col in CATEGORY_COLUMNS], observed=True).sum(),
+        'box_stats': compute_box_stats(df_filtered),
+        'sorted_costs': sorted_costs
+    }
+
+# Sankey edges per hierarchy step (key in aggregate_slice, link color)
+SANKEY_EDGES = [
+    ('by_L1_L2', 'rgba(0, 24, 168, 0.3)'),
+    ('by_L2_L3', 'rgba(0, 191, 255, 0.3)'),
+    ('by_L3_L4', 'rgba(65, 105, 225, 0.3)'),
+    ('by_L4_L5', 'rgba(135, 206, 235, 0.3)')
+]
+
+# Color palettes of the pie charts, copied to lists once
+BLUES_R = list(sequential_colors.Blues_r)
+BLUES = list(sequential_colors.Blues)
+
+# Static chart layouts, built once at import (separators: German number format)
+SANKEY_LAYOUT = dict(
+    separators=',.',
+    title="Kostenfluss durch alle Hierarchieebenen",
+    font=dict(size=12),
+    height=700
+)
+
+def create_sankey(aggs):
+    """Create a Sankey diagram of all hierarchy levels from the edge sums of aggregate_slice"""
+    edges = [aggs[key] for key, _ in SANKEY_EDGES]
+    
+    # Nodes: all labels of both edge ends, sorted and deduplicated once
+    sources = np.concatenate([edge.index.get_level_values(0).astype(str).to_numpy() for edge in edges])
+    targets = np.concatenate([edge.index.get_level_values(1).astype(str).to_numpy() for edge in edges])
+    all_nodes = np.unique(np.concatenate([sources, targets]))
+    
+    # Links via array indices instead of row loops
+    links_source = np.searchsorted(all_nodes, sources)
+    links_target = np.searchsorted(all_nodes, targets)
+    links_value = np.concatenate([edge.to_numpy() for edge in edges])
+    links_color = np.concatenate([np.full(len(edge), color) for edge, (_, color) in zip(edges, SANKEY_EDGES)])
+    
+    # Create Sankey
     fig = go.Figure(data=[go.Sankey(
         node=dict(
             pad=15,
             thickness=20,
             line=dict(color='white', width=0.5),
-            label=all_nodes,
+            label=all_nodes.tolist(),
             color='#0018A8'
         ),
         link=dict(
@@ -1123,17 +1151,22 @@ def create_sankey(df_filtered):
         )
     )])
     
-    fig.update_layout(
-        title="Kostenfluss durch alle Hierarchieebenen",
-        font=dict(size=12),
-        height=700
-    )
+    fig.update_layout(SANKEY_LAYOUT)
     
     return fig
 
-def create_region_bar(df_filtered):
-    """Erstellt ein Balkendiagramm nach Regionen"""
-    region_costs = df_filtered.groupby('Level2')['Cost'].sum().sort_values(ascending=True)
+REGION_BAR_LAYOUT = dict(
+    separators=',.',
+    xaxis_title="Kosten (€)",
+    yaxis_title="",
+    showlegend=False,
+    margin=dict(l=100, r=50, t=10, b=50),
+    height=400
+)
+
+def create_region_bar(by_region):
+    """Create a bar chart by region"""
+    region_costs = by_region.sort_values(ascending=True)
     
     fig = go.Figure(go.Bar(
         x=region_costs.values,
@@ -1144,96 +1177,109 @@ def create_region_bar(df_filtered):
             colorscale='Blues',
             showscale=False
         ),
-        text=[f"€{val:,.0f}".replace(',', '.') for val in region_costs.values],
+        texttemplate='€%{x:,.0f}',
         textposition='outside',
         hovertemplate='<b>%{y}</b><br>€%{x:,.0f}<extra></extra>'
     ))
     
-    fig.update_layout(
-        xaxis_title="Kosten (€)",
-        yaxis_title="",
-        showlegend=False,
-        margin=dict(l=100, r=50, t=10, b=50),
-        height=400
-    )
+    fig.update_layout(REGION_BAR_LAYOUT)
     
     return fig
 
-def create_division_pie(df_filtered):
-    """Erstellt ein Tortendiagramm nach Divisionen"""
-    division_costs = df_filtered.groupby('Level4')['Cost'].sum().sort_values(ascending=False)
+DIVISION_PIE_LAYOUT = dict(
+    separators=',.',
+    showlegend=True,
+    legend=dict(orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.1),
+    margin=dict(l=10, r=150, t=10, b=10),
+    height=400
+)
+
+def create_division_pie(by_division):
+    """Create a pie chart by division"""
+    division_costs = by_division.sort_values(ascending=False)
     
     fig = go.Figure(go.Pie(
         labels=division_costs.index,
         values=division_costs.values,
         hole=0.4,
-        marker=dict(colors=px.colors.sequential.Blues_r),
+        marker=dict(colors=BLUES_R[:len(division_costs)]),
         textposition='auto',
         textinfo='label+percent',
         hovertemplate='<b>%{label}</b><br>€%{value:,.0f}<br>%{percent}<extra></extra>'
     ))
     
-    fig.update_layout(
-        showlegend=True,
-        legend=dict(orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.1),
-        margin=dict(l=10, r=150, t=10, b=10),
-        height=400
-    )
+    fig.update_layout(DIVISION_PIE_LAYOUT)
     
     return fig
 
-def create_top_services(df_filtered):
-    """Top 10 Services nach Kosten"""
-    top_services = df_filtered.groupby('Level5')['Cost'].sum().nlargest(10).sort_values()
+TOP_SERVICES_LAYOUT = dict(
+    separators=',.',
+    xaxis_title="Kosten (€)",
+    yaxis_title="",
+    showlegend=False,
+    margin=dict(l=150, r=10, t=10, b=50),
+    height=350
+)
+
+def create_top_services(by_service):
+    """Top 10 services by cost"""
+    top_services = by_service.sort_values(ascending=False).head(10).iloc[::-1]
     
     fig = go.Figure(go.Bar(
         x=top_services.values,
         y=top_services.index,
         orientation='h',
         marker=dict(color='#0018A8'),
-        text=[f"€{val:,.0f}".replace(',', '.') for val in top_services.values],
+        texttemplate='€%{x:,.0f}',
         textposition='outside',
         hovertemplate='<b>%{y}</b><br>€%{x:,.0f}<extra></extra>'
     ))
     
-    fig.update_layout(
-        xaxis_title="Kosten (€)",
-        yaxis_title="",
-        showlegend=False,
-        margin=dict(l=150, r=10, t=10, b=50),
-        height=350
-    )
+    fig.update_layout(TOP_SERVICES_LAYOUT)
     
     return fig
 
-def create_top_countries(df_filtered):
-    """Top 10 Länder nach Kosten"""
-    top_countries = df_filtered.groupby('Level3')['Cost'].sum().nlargest(10).sort_values()
+TOP_COUNTRIES_LAYOUT = dict(
+    separators=',.',
+    xaxis_title="Kosten (€)",
+    yaxis_title="",
+    showlegend=False,
+    margin=dict(l=100, r=10, t=10, b=50),
+    height=350
+)
+
+def create_top_countries(by_country):
+    """Top 10 countries by cost"""
+    top_countries = by_country.sort_values(ascending=False).head(10).iloc[::-1]
     
     fig = go.Figure(go.Bar(
         x=top_countries.values,
         y=top_countries.index,
         orientation='h',
         marker=dict(color='#00BFFF'),
-        text=[f"€{val:,.0f}".replace(',', '.') for val in top_countries.values],
+        texttemplate='€%{x:,.0f}',
         textposition='outside',
         hovertemplate='<b>%{y}</b><br>€%{x:,.0f}<extra></extra>'
     ))
     
-    fig.update_layout(
-        xaxis_title="Kosten (€)",
-        yaxis_title="",
-        showlegend=False,
-        margin=dict(l=100, r=10, t=10, b=50),
-        height=350
-    )
+    fig.update_layout(TOP_COUNTRIES_LAYOUT)
     
     return fig
 
-def create_service_donut(df_filtered):
-    """Donut Chart für Service-Typen"""
-    service_costs = df_filtered.groupby('Level5')['Cost'].sum().nlargest(8)
-    other = df_filtered.groupby('Level5')['Cost'].sum().nsmallest(len(df_filtered['Level5'].unique()) - 8).sum()
+SERVICE_DONUT_LAYOUT = dict(
+    separators=',.',
+    showlegend=True,
+    legend=dict(orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.05, font=dict(size=9)),
+    margin=dict(l=10, r=120, t=10, b=10),
+    height=350
+)
+
+def create_service_donut(by_service):
+    """Donut chart of service types"""
+    ranked = by_service.sort_values(ascending=False)
+    service_costs = ranked.iloc[:8].copy()
+    service_costs.index = service_costs.index.astype(str)
+    other = ranked.iloc[8:].sum()
     
     if other > 0:
         service_costs['Andere'] = other
@@ -1242,177 +1288,196 @@ def create_service_donut(df_filtered):
         labels=service_costs.index,
         values=service_costs.values,
         hole=0.6,
-        marker=dict(colors=px.colors.sequential.Blues),
+        marker=dict(colors=BLUES[:len(service_costs)]),
         textposition='auto',
         textinfo='percent',
         hovertemplate='<b>%{label}</b><br>€%{value:,.0f}<br>%{percent}<extra></extra>'
     ))
     
-    fig.update_layout(
-        showlegend=True,
-        legend=dict(orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.05, font=dict(size=9)),
-        margin=dict(l=10, r=120, t=10, b=10),
-        height=350
-    )
+    fig.update_layout(SERVICE_DONUT_LAYOUT)
     
     return fig
 
-def create_heatmap(df_filtered):
-    """Heatmap für Region vs Division"""
-    # Gruppierung und Pivot
-    heatmap_data = df_filtered.groupby(['Level2', 'Level4'])['Cost'].sum().reset_index()
-    heatmap_pivot = heatmap_data.pivot(index='Level2', columns='Level4', values='Cost')
-    heatmap_pivot = heatmap_pivot.fillna(0)
-    
-    # Erstelle Text-Array für Anzeige
-    text_array = []
-    for i in range(len(heatmap_pivot)):
-        row_text = []
-        for j in range(len(heatmap_pivot.columns)):
-            val = heatmap_pivot.iloc[i, j]
-            if val > 0:
-                row_text.append(f"€{val:,.0f}".replace(',', '.'))
-            else:
-                row_text.append("")
-        text_array.append(row_text)
+HEATMAP_LAYOUT = dict(
+    separators=',.',
+    xaxis_title="Division",
+    yaxis_title="Region",
+    margin=dict(l=100, r=50, t=10, b=100),
+    height=500,
+    xaxis=dict(side='bottom', tickangle=-45),
+    yaxis=dict(side='left')
+)
+
+def create_heatmap(by_region_division):
+    """Heatmap of region vs division"""
+    # Pivot of the precomputed sums; missing combinations stay empty (NaN)
+    heatmap_pivot = by_region_division.unstack()
     
     fig = go.Figure(go.Heatmap(
         z=heatmap_pivot.values,
         x=heatmap_pivot.columns.tolist(),
         y=heatmap_pivot.index.tolist(),
         colorscale='Blues',
-        text=text_array,
-        texttemplate='%{text}',
+        texttemplate='€%{z:,.0f}',
         textfont={"size": 9},
+        hoverongaps=False,
         hovertemplate='<b>Region:</b> %{y}<br><b>Division:</b> %{x}<br><b>Kosten:</b> €%{z:,.0f}<extra></extra>',
         colorbar=dict(title="Kosten (€)")
     ))
     
-    fig.update_layout(
-        xaxis_title="Division",
-        yaxis_title="Region",
-        margin=dict(l=100, r=50, t=10, b=100),
-        height=500,
-        xaxis=dict(side='bottom'),
-        yaxis=dict(side='left')
-    )
-    
-    fig.update_xaxes(tickangle=-45)
+    fig.update_layout(HEATMAP_LAYOUT)
     
     return fig
 
-def create_cumulative(df_filtered):
-    """Kumulative Kostenverteilung"""
-    sorted_costs = df_filtered.sort_values('Cost', ascending=False).copy()
-    sorted_costs['Cumulative'] = sorted_costs['Cost'].cumsum()
-    sorted_costs['Percentage'] = (sorted_costs['Cumulative'] / sorted_costs['Cost'].sum()) * 100
-    sorted_costs['Index'] = range(1, len(sorted_costs) + 1)
+# Beyond this length the cumulative curve is thinned out to CUMULATIVE_SAMPLE_POINTS points
+CUMULATIVE_MAX_POINTS = 5000
+CUMULATIVE_SAMPLE_POINTS = 500
+
+CUMULATIVE_LAYOUT = dict(
+    separators=',.',
+    xaxis_title="Anzahl Einträge (sortiert)",
+    yaxis_title="Kumulative Kosten (€)",
+    showlegend=True,
+    margin=dict(l=80, r=50, t=10, b=50),
+    height=400
+)
+
+def create_cumulative(sorted_costs):
+    """Cumulative cost distribution (sorted_costs in descending order)"""
+    cumulative = np.cumsum(sorted_costs)
+    positions = np.arange(1, len(cumulative) + 1)
+    
+    # The curve is monotonic, a few hundred points look identical
+    if len(cumulative) > CUMULATIVE_MAX_POINTS:
+        idx = np.linspace(0, len(cumulative) - 1, CUMULATIVE_SAMPLE_POINTS).astype(int)
+        positions, cumulative = positions[idx], cumulative[idx]
     
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
-        x=sorted_costs['Index'],
-        y=sorted_costs['Cumulative'],
+    fig.add_trace(go.Scattergl(
+        x=positions,
+        y=cumulative,
         mode='lines',
         name='Kumulative Kosten',
         line=dict(color='#0018A8', width=3),
         fill='tozeroy',
+        hoverinfo='x+y',
         hovertemplate='Position: %{x}<br>Kumulativ: €%{y:,.0f}<extra></extra>'
     ))
     
-    fig.update_layout(
-        xaxis_title="Anzahl Einträge (sortiert)",
-        yaxis_title="Kumulative Kosten (€)",
-        showlegend=True,
-        margin=dict(l=80, r=50, t=10, b=50),
-        height=400
-    )
+    fig.update_layout(CUMULATIVE_LAYOUT)
     
     return fig
 
-def create_box_plot(df_filtered):
-    """Box Plot für Kostenverteilung nach Regionen"""
-    fig = go.Figure()
-    
-    for region in sorted(df_filtered['Level2'].unique()):
-        region_data = df_filtered[df_filtered['Level2'] == region]['Cost']
-        fig.add_trace(go.Box(
-            y=region_data,
-            name=region,
-            marker_color='#0018A8',
-            boxmean='sd',
-            hovertemplate='%{y:,.0f}<extra></extra>'
-        ))
-    
-    fig.update_layout(
-        yaxis_title="Kosten (€)",
-        xaxis_title="Region",
-        showlegend=False,
-        margin=dict(l=80, r=50, t=10, b=100),
-        height=400
-    )
+BOX_PLOT_LAYOUT = dict(
+    separators=',.',
+    yaxis_title="Kosten (€)",
+    xaxis_title="Region",
+    showlegend=False,
+    margin=dict(l=80, r=50, t=10, b=100),
+    height=400,
+    xaxis=dict(tickangle=-45)
+)
+
+def create_box_plot(box_stats):
+    """Box plot of the cost distribution by region from precomputed statistics"""
+    fig = go.Figure(go.Box(
+        x=box_stats.index.astype(str).tolist(),
+        q1=box_stats['q1'],
+        median=box_stats['median'],
+        q3=box_stats['q3'],
+        lowerfence=box_stats['lowerfence'],
+        upperfence=box_stats['upperfence'],
+        mean=box_stats['mean'],
+        sd=box_stats['sd'],
+        marker_color='#0018A8',
+        boxmean='sd',
+        boxpoints=False,
+        hovertemplate='%{y:,.0f}<extra></extra>'
+    ))
     
-    fig.update_xaxes(tickangle=-45)
+    fig.update_layout(BOX_PLOT_LAYOUT)
     
     return fig
 
-def create_sunburst(df_filtered):
-    """Sunburst Chart für hierarchische Darstellung"""
-    fig = px.sunburst(
-        df_filtered,
-        path=['Level2', 'Level3', 'Level4', 'Level5'],
-        values='Cost',
-        color='Cost',
-        color_continuous_scale='Blues',
-        hover_data={'Cost': ':,.0f'}
-    )
-    
-    fig.update_layout(
-        margin=dict(l=10, r=10, t=10, b=10),
-        height=500
-    )
-    
-    fig.update_traces(
+SUNBURST_LAYOUT = dict(
+    separators=',.',
+    margin=dict(l=10, r=10, t=10, b=10),
+    height=500
+)
+
+def create_sunburst(by_path, squares_by_path):
+    """Sunburst chart of the hierarchy from the cost and squared cost sums per Level2-Level5 path"""
+    ids, labels, parents, values, colors = [], [], [], [], []
+    
+    # Nodes of every level: sum over the deeper levels, ids as path "L2/L3/..."
+    for depth in range(1, by_path.index.nlevels + 1):
+        level_costs = by_path.groupby(level=list(range(depth)), observed=True).sum()
+        level_squares = squares_by_path.groupby(level=list(range(depth)), observed=True).sum()
+        path = level_costs.index.to_frame(index=False).astype(str)
+        
+        node_ids = path.iloc[:, 0]
+        parent_ids = pd.Series('', index=path.index)
+        for col in path.columns[1:]:
+            parent_ids = node_ids
+            node_ids = node_ids + '/' + path[col]
+        
+        ids.extend(node_ids.tolist())
+        labels.extend(path.iloc[:, -1].tolist())
+        parents.extend(parent_ids.tolist())
+        values.extend(level_costs.tolist())
+        # Colored by the cost-weighted mean cost of the rows below, as px.sunburst(color='Cost') did
+        colors.extend((level_squares / level_costs).tolist())
+    
+    fig = go.Figure(go.Sunburst(
+        ids=ids,
+        labels=labels,
+        parents=parents,
+        values=values,
+        branchvalues='total',
+        marker=dict(colors=colors, colorscale='Blues', colorbar=dict(title='Cost')),
         hovertemplate='<b>%{label}</b><br>Kosten: €%{value:,.0f}<extra></extra>'
-    )
+    ))
+    
+    fig.update_layout(SUNBURST_LAYOUT)
     
     return fig
 
-def create_radar(df_filtered):
-    """Radar Chart für Top Divisionen nach Regionen"""
-    # Top 5 Divisionen
-    top_divisions = df_filtered.groupby('Level4')['Cost'].sum().nlargest(5).index
+RADAR_LAYOUT = dict(
+    separators=',.',
+    polar=dict(
+        radialaxis=dict(visible=True, showticklabels=True)
+    ),
+    showlegend=True,
+    legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.1),
+    margin=dict(l=80, r=150, t=50, b=50),
+    height=500
+)
+
+def create_radar(by_region, by_division, by_region_division):
+    """Radar chart of the top divisions by region"""
+    # Top 5 divisions
+    top_divisions = by_division.nlargest(5).index
     
-    # Top 5 Regionen
-    top_regions = df_filtered.groupby('Level2')['Cost'].sum().nlargest(5).index
+    # Top 5 regions
+    top_regions = by_region.nlargest(5).index
+    
+    # Region x division matrix of the top 5, missing combinations = 0
+    pivot = by_region_division.unstack(fill_value=0).reindex(
+        index=top_regions, columns=top_divisions, fill_value=0)
     
     fig = go.Figure()
     
-    for region in top_regions:
-        region_data = df_filtered[df_filtered['Level2'] == region]
-        division_costs = []
-        
-        for division in top_divisions:
-            cost = region_data[region_data['Level4'] == division]['Cost'].sum()
-            division_costs.append(cost)
-        
+    for region, division_costs in pivot.iterrows():
         fig.add_trace(go.Scatterpolar(
-            r=division_costs,
+            r=division_costs.tolist(),
             theta=list(top_divisions),
             fill='toself',
             name=region,
             hovertemplate='<b>%{theta}</b><br>€%{r:,.0f}<extra></extra>'
         ))
     
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(visible=True, showticklabels=True)
-        ),
-        showlegend=True,
-        legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.1),
-        margin=dict(l=80, r=150, t=50, b=50),
-        height=500
-    )
+    fig.update_layout(RADAR_LAYOUT)
     
     return fig
 
@@ -1447,7 +1512,9 @@ def create_ml_analysis_page(username):
                                 value='small',
                                 inline=False
                             ),
-                            html.Div(id='ml-model-status', style={'marginTop': '20px'})
+                            html.Div(id='ml-model-status', style={'marginTop': '20px'}),
+                            dcc.Store(id='ml-charts-signature'),
+                            dcc.Store(id='ml-charts-store')
                         ], className="ai-panel-card")
                     ], width=4),
                     
@@ -1501,8 +1568,8 @@ def create_ml_analysis_page(username):
                                     html.Label("Region (Level 2):", style={'fontWeight': '600', 'color': '#333'}),
                                     dcc.Dropdown(
                                         id='ml-predict-level2',
-                                        options=[{'label': i, 'value': i} for i in sorted(df['Level2'].unique())],
-                                        value=df['Level2'].unique()[0],
+                                        options=LEVEL_OPTIONS['Level2'],
+                                        value=LEVEL_DEFAULTS['Level2'],
                                         style={'marginBottom': '15px'}
                                     )
                                 ], width=3),
@@ -1510,8 +1577,8 @@ def create_ml_analysis_page(username):
                                     html.Label("Country (Level 3):", style={'fontWeight': '600', 'color': '#333'}),
                                     dcc.Dropdown(
                                         id='ml-predict-level3',
-                                        options=[{'label': i, 'value': i} for i in sorted(df['Level3'].unique())],
-                                        value=df['Level3'].unique()[0],
+                                        options=LEVEL_OPTIONS['Level3'],
+                                        value=LEVEL_DEFAULTS['Level3'],
                                         style={'marginBottom': '15px'}
                                     )
                                 ], width=3),
@@ -1519,8 +1586,8 @@ def create_ml_analysis_page(username):
                                     html.Label("Division (Level 4):", style={'fontWeight': '600', 'color': '#333'}),
                                     dcc.Dropdown(
                                         id='ml-predict-level4',
-                                        options=[{'label': i, 'value': i} for i in sorted(df['Level4'].unique())],
-                                        value=df['Level4'].unique()[0],
+                                        options=LEVEL_OPTIONS['Level4'],
+                                        value=LEVEL_DEFAULTS['Level4'],
                                         style={'marginBottom': '15px'}
                                     )
                                 ], width=3),
@@ -1528,8 +1595,8 @@ def create_ml_analysis_page(username):
                                     html.Label("Service (Level 5):", style={'fontWeight': '600', 'color': '#333'}),
                                     dcc.Dropdown(
                                         id='ml-predict-level5',
-                                        options=[{'label': i, 'value': i} for i in sorted(df['Level5'].unique())],
-                                        value=df['Level5'].unique()[0],
+                                        options=LEVEL_OPTIONS['Level5'],
+                                        value=LEVEL_DEFAULTS['Level5'],
                                         style={'marginBottom': '15px'}
                                     )
                                 ], width=3)
@@ -1564,7 +1631,7 @@ def create_ml_analysis_page(username):
                         ], className="ai-panel-card")
                     ], width=12)
                 ])
-            ], style=custom_style)
+            ], className="page-background")
         ], fluid=True, style={'backgroundColor': '#F4F4F4', 'minHeight': '100vh'})
     ])
 
@@ -1638,8 +1705,8 @@ def create_ai_admin_modal():
                             html.Label("Region (Level 2):", style={'fontWeight': '600', 'color': '#333'}),
                             dcc.Dropdown(
                                 id='predict-level2',
-                                options=[{'label': i, 'value': i} for i in sorted(df['Level2'].unique())],
-                                value=df['Level2'].unique()[0],
+                                options=LEVEL_OPTIONS['Level2'],
+                                value=LEVEL_DEFAULTS['Level2'],
                                 style={'marginBottom': '15px'}
                             )
                         ], width=6),
@@ -1647,8 +1714,8 @@ def create_ai_admin_modal():
                             html.Label("Country (Level 3):", style={'fontWeight': '600', 'color': '#333'}),
                             dcc.Dropdown(
                                 id='predict-level3',
-                                options=[{'label': i, 'value': i} for i in sorted(df['Level3'].unique())],
-                                value=df['Level3'].unique()[0],
+                                options=LEVEL_OPTIONS['Level3'],
+                                value=LEVEL_DEFAULTS['Level3'],
                                 style={'marginBottom': '15px'}
                             )
                         ], width=6)
@@ -1658,8 +1725,8 @@ def create_ai_admin_modal():
                             html.Label("Division (Level 4):", style={'fontWeight': '600', 'color': '#333'}),
                             dcc.Dropdown(
                                 id='predict-level4',
-                                options=[{'label': i, 'value': i} for i in sorted(df['Level4'].unique())],
-                                value=df['Level4'].unique()[0],
+                                options=LEVEL_OPTIONS['Level4'],
+                                value=LEVEL_DEFAULTS['Level4'],
                                 style={'marginBottom': '15px'}
                             )
                         ], width=6),
@@ -1667,8 +1734,8 @@ def create_ai_admin_modal():
                             html.Label("Service (Level 5):", style={'fontWeight': '600', 'color': '#333'}),
                             dcc.Dropdown(
                                 id='predict-level5',
-                                options=[{'label': i, 'value': i} for i in sorted(df['Level5'].unique())],
-                                value=df['Level5'].unique()[0],
+                                options=LEVEL_OPTIONS['Level5'],
+                                value=LEVEL_DEFAULTS['Level5'],
                                 style={'marginBottom': '15px'}
                             )
                         ], width=6)
@@ -1704,85 +1771,121 @@ def create_ai_admin_modal():
     ], id="ai-admin-modal", is_open=False, size="xl", backdrop=True, scrollable=True)
 
 # AI Model Training Function
+def fit_affine(values):
+    """Fit standard scaling and return it as float32 (mean, inv_scale) arrays"""
+    from sklearn.preprocessing import StandardScaler
+    scaler = StandardScaler().fit(values)
+    mean = scaler.mean_.astype(np.float32)
+    inv_scale = (1.0 / scaler.scale_).astype(np.float32)
+    return mean, inv_scale
+
+@functools.lru_cache(maxsize=1)
 def prepare_data_for_training():
-    """Prepare data for neural network training"""
-    df_train = df.copy()
-    
-    # Encode categorical variables
+    """Prepare data for neural network training (df never changes, so this runs once)"""
+    # Encode categorical variables with the category codes over the sorted level values
+    # (the same label -> index mapping LabelEncoder produced)
     encoders = {}
-    for col in ['Level2', 'Level3', 'Level4', 'Level5']:
-        le = LabelEncoder()
-        df_train[col + '_encoded'] = le.fit_transform(df_train[col])
-        encoders[col] = le
-    
-    # Create features
-    X = df_train[['Level2_encoded', 'Level3_encoded', 'Level4_encoded', 'Level5_encoded']].values
-    y = df_train['Cost'].values.reshape(-1, 1)
-    
-    # Scale features and target
-    scaler_X = StandardScaler()
-    scaler_y = StandardScaler()
-    X_scaled = scaler_X.fit_transform(X)
-    y_scaled = scaler_y.fit_transform(y)
-    
-    return X_scaled, y_scaled, scaler_X, scaler_y, encoders
+    codes = []
+    for col in CATEGORY_COLUMNS:
+        codes.append(df[col].cat.reorder_categories(LEVEL_ORDER[col]).cat.codes.to_numpy())
+        encoders[col] = {label: idx for idx, label in enumerate(LEVEL_ORDER[col])}
+    
+    # Features stay compact integer codes (int8 for < 128 values per level),
+    # the networks embed them; only the target is scaled
+    X = np.column_stack(codes)
+    vocab_sizes = tuple(len(LEVEL_ORDER[col]) for col in CATEGORY_COLUMNS)
+    y = df['Cost'].to_numpy().reshape(-1, 1).astype(np.float32)
+    
+    # Scale the target (float32 end to end, matching the model weights)
+    scaler_y = fit_affine(y)
+    y_scaled = (y - scaler_y[0]) * scaler_y[1]
+    
+    return X, y_scaled, vocab_sizes, scaler_y, encoders
 
-def train_model(model_type, epochs=50, learning_rate=0.001):
-    """Train the selected neural network model"""
-    try:
-        X, y, scaler_X, scaler_y, encoders = prepare_data_for_training()
-        
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        
-        # Convert to tensors
-        X_train_tensor = torch.FloatTensor(X_train)
-        y_train_tensor = torch.FloatTensor(y_train)
-        X_test_tensor = torch.FloatTensor(X_test)
-        y_test_tensor = torch.FloatTensor(y_test)
-        
-        # Initialize model
-        input_size = X_train.shape[1]
-        if model_type == 'small':
-            model = SmallCostPredictor(input_size)
-        else:
-            model = BigCostPredictor(input_size)
+@functools.lru_cache(maxsize=1)
+def training_split():
+    """Cached 80/20 train/test split of the prepared data (fixed random_state)"""
+    from sklearn.model_selection import train_test_split
+    X, y, vocab_sizes, scaler_y, encoders = prepare_data_for_training()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    return X_train, X_test, y_train, y_test, vocab_sizes, scaler_y, encoders
+
+@functools.lru_cache(maxsize=16)
+def fit_model(model_type, epochs, learning_rate):
+    """Train a fresh network and build its predictor, memoized so identical hyperparameters are not retrained.
+    
+    Returns (model, predictor, final_train_loss, test_loss, vocab_sizes); failed runs raise and are not cached.
+    """
+    # Heavy ML dependencies are imported on first use to keep app startup fast
+    import torch
+    import torch.nn as nn
+    from cost_models import DEVICE, training_module, reset_parameters, fused_epochs, build_predictor
+    
+    # Prepared and split once, later trainings only rerun the PyTorch loop
+    X_train, X_test, y_train, y_test, vocab_sizes, _, _ = training_split()
+    
+    # Convert to tensors (integer level codes and float32 targets); the whole table
+    # fits on the device, so it is copied once and batches are gathered there
+    X_train_tensor = torch.from_numpy(np.ascontiguousarray(X_train)).to(DEVICE)
+    y_train_tensor = torch.from_numpy(np.ascontiguousarray(y_train, dtype=np.float32)).to(DEVICE)
+    X_test_tensor = torch.from_numpy(np.ascontiguousarray(X_test)).to(DEVICE)
+    y_test_tensor = torch.from_numpy(np.ascontiguousarray(y_test, dtype=np.float32)).to(DEVICE)
+    
+    # Initialize model: the compiled network of this architecture, re-initialized
+    batch_size = min(TRAIN_BATCH_SIZE, len(X_train_tensor))
+    model, compiled_model, lock = training_module(model_type, vocab_sizes, batch_size, X_train_tensor.dtype)
+    with lock:
+        reset_parameters(model)
+        model.train()
         
         # Loss and optimizer
         criterion = nn.MSELoss()
         optimizer = torch.optim.Adam(model.parameters(), lr=learning_rate)
         
-        # Training loop
-        model.train()
-        train_losses = []
-        for epoch in range(epochs):
-            optimizer.zero_grad()
-            outputs = model(X_train_tensor)
-            loss = criterion(outputs, y_train_tensor)
-            loss.backward()
-            optimizer.step()
-            train_losses.append(loss.item())
+        # Training loop in fused blocks, synchronizing with the device once per block
+        if epochs < 1:
+            raise ValueError(f"epochs must be at least 1, got {epochs}")
+        for first_epoch in range(0, epochs, FUSED_EPOCHS):
+            block_losses = fused_epochs(compiled_model, criterion, optimizer, X_train_tensor, y_train_tensor,
+                                        batch_size, min(FUSED_EPOCHS, epochs - first_epoch))
+            train_loss = block_losses[-1].item()
         
         # Evaluate
         model.eval()
-        with torch.no_grad():
+        with torch.inference_mode():
             test_outputs = model(X_test_tensor)
             test_loss = criterion(test_outputs, y_test_tensor).item()
         
-        # Store model
-        trained_models[model_type]['model'] = model
-        trained_models[model_type]['scaler'] = scaler_y
-        trained_models[model_type]['encoders'] = encoders
-        trained_models[model_type]['trained'] = True
+        # The shared network is reused by the next run, the caller gets its own copy
+        trained = copy.deepcopy(model)
+    
+    return trained, build_predictor(trained), train_loss, test_loss, vocab_sizes
+
+def train_model(model_type, epochs=50, learning_rate=0.001):
+    """Train the selected neural network model"""
+    try:
+        model, predictor, train_loss, test_loss, vocab_sizes = fit_model(model_type, epochs, learning_rate)
+        _, _, _, _, _, scaler_y, encoders = training_split()
+        
+        # Store model and checkpoint it, unless these hyperparameters are already the active model
+        fit = (epochs, learning_rate)
+        entry = trained_models[model_type]
+        if not (entry['trained'] and entry['fit'] == fit):
+            entry['model'] = predictor
+            entry['scaler'] = scaler_y
+            entry['encoders'] = encoders
+            entry['trained'] = True
+            entry['fit'] = fit
+            save_trained_model(model_type, model, vocab_sizes)
         
-        return True, train_losses[-1], test_loss
+        return True, train_loss, test_loss
     except Exception as e:
         return False, str(e), None
 
 def predict_cost(model_type, level2, level3, level4, level5):
     """Predict cost using trained model"""
     try:
-        if not trained_models[model_type]['trained']:
+        if not is_trained(model_type):
             return None, "Model not trained yet. Please train the model first."
         
         model = trained_models[model_type]['model']
@@ -1790,40 +1893,20 @@ def predict_cost(model_type, level2, level3, level4, level5):
         encoders = trained_models[model_type]['encoders']
         
         # Encode inputs
-        level2_enc = encoders['Level2'].transform([level2])[0]
-        level3_enc = encoders['Level3'].transform([level3])[0]
-        level4_enc = encoders['Level4'].transform([level4])[0]
-        level5_enc = encoders['Level5'].transform([level5])[0]
-        
-        # Prepare input
-        X_input = np.array([[level2_enc, level3_enc, level4_enc, level5_enc]])
-        
-        # Scale (using same scaler from training - simplified)
-        X_input_scaled = (X_input - X_input.mean()) / (X_input.std() + 1e-8)
+        level2_enc = encoders['Level2'].get(level2, 0)
+        level3_enc = encoders['Level3'].get(level3, 0)
+        level4_enc = encoders['Level4'].get(level4, 0)
+        level5_enc = encoders['Level5'].get(level5, 0)
         
-        # Predict
-        model.eval()
-        with torch.no_grad():
-            X_tensor = torch.FloatTensor(X_input_scaled)
-            prediction_scaled = model(X_tensor).numpy()
-        
-        # Inverse transform (simplified - in production use proper scaler)
-        # For now, we'll use a simple approximation
-        prediction = prediction_scaled[0][0]
+        # Prepare input (level codes, embedded by the network)
+        X_input = np.array([[level2_enc, level3_enc, level4_enc, level5_enc]], dtype=np.int64)
         
-        # Get average cost for similar entries as baseline
-        similar_costs = df[(df['Level2'] == level2) & 
-                          (df['Level3'] == level3) & 
-                          (df['Level4'] == level4) & 
-                          (df['Level5'] == level5)]['Cost'].values
+        # Predict (the stored predictor already runs under inference mode)
+        prediction_scaled = model(X_input)
         
-        if len(similar_costs) > 0:
-            baseline = similar_costs.mean()
-            # Adjust prediction to be in reasonable range
-            prediction = baseline * (1 + prediction * 0.3)  # Scale adjustment
-        else:
-            # Use overall mean if no similar entries
-            prediction = df['Cost'].mean() * (1 + prediction * 0.3)
+        # Undo the target scaling fitted during training
+        mean, inv_scale = scaler
+        prediction = float(prediction_scaled[0][0] / inv_scale[0] + mean[0])
         
         return max(0, prediction), None  # Ensure non-negative
     except Exception as e:
@@ -1845,10 +1928,10 @@ def toggle_ai_modal(open_clicks, close_clicks, is_open):
 def create_model_status_display():
     return html.Div([
         html.P("Model Status:", style={'fontWeight': '600', 'color': '#333'}),
-        html.P("Small Model: " + ("✓ Trained" if trained_models['small']['trained'] else "✗ Not Trained"),
-              style={'color': '#28a745' if trained_models['small']['trained'] else '#dc3545'}),
-        html.P("Big Model: " + ("✓ Trained" if trained_models['big']['trained'] else "✗ Not Trained"),
-              style={'color': '#28a745' if trained_models['big']['trained'] else '#dc3545'})
+        html.P("Small Model: " + ("✓ Trained" if is_trained('small') else "✗ Not Trained"),
+              style={'color': '#28a745' if is_trained('small') else '#dc3545'}),
+        html.P("Big Model: " + ("✓ Trained" if is_trained('big') else "✗ Not Trained"),
+              style={'color': '#28a745' if is_trained('big') else '#dc3545'})
     ])
 
 # Callback to update model status display (on model selection change)
@@ -1912,7 +1995,7 @@ def predict_cost_callback(n_clicks, model_type, level2, level3, level4, level5):
     if n_clicks is None:
         return ""
     
-    if not trained_models[model_type]['trained']:
+    if not is_trained(model_type):
         return dbc.Alert("Please train the model first before making predictions!", color="warning")
     
     if not all([level2, level3, level4, level5]):
@@ -1935,20 +2018,6 @@ def predict_cost_callback(n_clicks, model_type, level2, level3, level4, level5):
 # Store for training history
 training_history = {'small': [], 'big': []}
 
-@app.callback(
-    Output('ml-model-status', 'children'),
-    [Input('ml-model-selection', 'value')]
-)
-def update_ml_model_status(model_type):
-    status = html.Div([
-        html.P("Model Status:", style={'fontWeight': '600', 'color': '#333', 'marginBottom': '10px'}),
-        html.P("Small Model: " + ("✓ Trained" if trained_models['small']['trained'] else "✗ Not Trained"),
-              style={'color': '#28a745' if trained_models['small']['trained'] else '#dc3545', 'marginBottom': '5px'}),
-        html.P("Big Model: " + ("✓ Trained" if trained_models['big']['trained'] else "✗ Not Trained"),
-              style={'color': '#28a745' if trained_models['big']['trained'] else '#dc3545'})
-    ])
-    return status
-
 @app.callback(
     [Output('ml-training-status', 'children'),
      Output('ml-training-animation', 'children'),
@@ -1997,6 +2066,9 @@ def ml_train_model_callback(n_clicks, model_type, epochs, lr):
     else:
         return dbc.Alert(f"Training failed: {train_loss}", color="danger"), "", no_update
 
+# Placeholder prediction chart shared by every early return (Dash only serializes it)
+EMPTY_PRED_FIG = {'data': [], 'layout': {'title': {'text': "No predictions yet"}, 'height': 300}}
+
 @app.callback(
     [Output('ml-prediction-result', 'children'),
      Output('ml-prediction-chart', 'figure')],
@@ -2009,28 +2081,19 @@ def ml_train_model_callback(n_clicks, model_type, epochs, lr):
     prevent_initial_call=True
 )
 def ml_predict_cost_callback(n_clicks, model_type, level2, level3, level4, level5):
-    if not trained_models[model_type]['trained']:
-        empty_fig = go.Figure()
-        empty_fig.update_layout(title="No predictions yet", height=300)
-        return dbc.Alert("Please train the model first before making predictions!", color="warning"), empty_fig
+    if not is_trained(model_type):
+        return dbc.Alert("Please train the model first before making predictions!", color="warning"), EMPTY_PRED_FIG
     
     if not all([level2, level3, level4, level5]):
-        empty_fig = go.Figure()
-        empty_fig.update_layout(title="No predictions yet", height=300)
-        return dbc.Alert("Please select all parameters", color="warning"), empty_fig
+        return dbc.Alert("Please select all parameters", color="warning"), EMPTY_PRED_FIG
     
     prediction, error = predict_cost(model_type, level2, level3, level4, level5)
     
     if error:
-        empty_fig = go.Figure()
-        empty_fig.update_layout(title="No predictions yet", height=300)
-        return dbc.Alert(f"Prediction error: {error}", color="danger"), empty_fig
+        return dbc.Alert(f"Prediction error: {error}", color="danger"), EMPTY_PRED_FIG
     
     # Get historical data for comparison
-    similar_costs = df[(df['Level2'] == level2) & 
-                      (df['Level3'] == level3) & 
-                      (df['Level4'] == level4) & 
-                      (df['Level5'] == level5)]['Cost'].values
+    historical_mean = GROUP_MEAN_COST.get((level2, level3, level4, level5))
     
     result = html.Div([
         html.H4("Predicted Cost", style={'color': 'white', 'marginBottom': '15px'}),
@@ -2040,93 +2103,121 @@ def ml_predict_cost_callback(n_clicks, model_type, level2, level3, level4, level
               style={'color': 'rgba(255,255,255,0.9)', 'marginTop': '10px', 'fontSize': '14px'})
     ], className="prediction-result")
     
-    # Prediction comparison chart
-    pred_fig = go.Figure()
-    if len(similar_costs) > 0:
-        pred_fig.add_trace(go.Bar(
-            x=['Historical Average', 'Predicted'],
-            y=[similar_costs.mean(), prediction],
-            marker_color=['#00BFFF', '#0018A8'],
-            text=[f"€{similar_costs.mean():,.0f}".replace(',', '.'), f"€{prediction:,.0f}".replace(',', '.')],
-            textposition='auto'
-        ))
+    # Prediction comparison chart, built as a plain figure dict (no graph_objects validation)
+    if historical_mean is not None:
+        bar = {
+            'type': 'bar',
+            'x': ['Historical Average', 'Predicted'],
+            'y': [historical_mean, prediction],
+            'marker': {'color': ['#00BFFF', '#0018A8']},
+            'text': [f"€{historical_mean:,.0f}".replace(',', '.'), f"€{prediction:,.0f}".replace(',', '.')],
+            'textposition': 'auto'
+        }
     else:
-        pred_fig.add_trace(go.Bar(
-            x=['Predicted'],
-            y=[prediction],
-            marker_color=['#0018A8'],
-            text=[f"€{prediction:,.0f}".replace(',', '.')],
-            textposition='auto'
-        ))
-    pred_fig.update_layout(
-        title="Prediction vs Historical Average",
-        xaxis_title="",
-        yaxis_title="Cost (€)",
-        height=300,
-        showlegend=False
-    )
+        bar = {
+            'type': 'bar',
+            'x': ['Predicted'],
+            'y': [prediction],
+            'marker': {'color': ['#0018A8']},
+            'text': [f"€{prediction:,.0f}".replace(',', '.')],
+            'textposition': 'auto'
+        }
+    pred_fig = {
+        'data': [bar],
+        'layout': {
+            'title': {'text': "Prediction vs Historical Average"},
+            'xaxis': {'title': {'text': ""}},
+            'yaxis': {'title': {'text': "Cost (€)"}},
+            'height': 300,
+            'showlegend': False
+        }
+    }
     
     return result, pred_fig
 
+# Longer training histories are reduced to this many points before plotting
+HISTORY_MAX_POINTS = 2000
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling of the line (x, y) to n_out points, keeping both ends"""
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return x, y
+    # Edges of the n_out - 2 buckets the inner points are split into
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    selected = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # The next bucket is represented by its mean point, the last one by the final point
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        # Keep the point spanning the largest triangle with the previously kept point and that mean
+        area = np.abs((x[selected] - avg_x) * (y[start:end] - y[selected])
+                      - (x[selected] - x[start:end]) * (avg_y - y[selected]))
+        selected = start + int(area.argmax())
+        keep[i + 1] = selected
+    return x[keep], y[keep]
+
+@functools.lru_cache(maxsize=32)
+def history_points(test_losses):
+    """Training runs and test losses of one model's history as plotted, LTTB-reduced when long"""
+    runs = np.arange(len(test_losses), dtype=np.int32)
+    losses = np.fromiter(test_losses, dtype=np.float32, count=len(test_losses))
+    if len(test_losses) > HISTORY_MAX_POINTS:
+        runs, losses = lttb(runs, losses, HISTORY_MAX_POINTS)
+    return runs.tolist(), losses.tolist()
+
+def record_timing(name, started, description):
+    """Report a Server-Timing entry since `started`, only for debug-mode requests"""
+    if flask.has_request_context() and app.server.debug:
+        callback_context.record_timing(name, time.perf_counter() - started, description)
+
+# Model status and the chart data update together, one round-trip per model toggle;
+# the browser keeps the signature of what it shows so unchanged outputs are skipped
 @app.callback(
-    [Output('ml-performance-chart', 'figure'),
-     Output('ml-training-history', 'figure')],
+    [Output('ml-model-status', 'children'),
+     Output('ml-charts-store', 'data'),
+     Output('ml-charts-signature', 'data')],
     [Input('ml-model-selection', 'value')],
+    [State('ml-charts-signature', 'data')],
     prevent_initial_call=False
 )
-def update_ml_charts(model_type):
-    # Performance chart
-    perf_fig = go.Figure()
-    perf_fig.add_trace(go.Bar(
-        x=['Small Model', 'Big Model'],
-        y=[
-            training_history['small'][-1]['test_loss'] if training_history['small'] and trained_models['small']['trained'] else 0,
-            training_history['big'][-1]['test_loss'] if training_history['big'] and trained_models['big']['trained'] else 0
-        ],
-        marker_color=['#0018A8' if trained_models['small']['trained'] else '#ccc',
-                     '#00BFFF' if trained_models['big']['trained'] else '#ccc'],
-        text=[
-            f"{training_history['small'][-1]['test_loss']:.4f}" if training_history['small'] and trained_models['small']['trained'] else "Not Trained",
-            f"{training_history['big'][-1]['test_loss']:.4f}" if training_history['big'] and trained_models['big']['trained'] else "Not Trained"
-        ],
-        textposition='auto'
-    ))
-    perf_fig.update_layout(
-        title="Model Performance (Test Loss)",
-        xaxis_title="Model",
-        yaxis_title="Test Loss",
-        height=300,
-        showlegend=False
-    )
+def update_ml_charts(model_type, shown_signature):
+    small_trained = is_trained('small')
+    big_trained = is_trained('big')
+    small_loss = training_history['small'][-1]['test_loss'] if training_history['small'] and small_trained else None
+    big_loss = training_history['big'][-1]['test_loss'] if training_history['big'] and big_trained else None
+    signature = [model_type, small_trained, big_trained, small_loss, big_loss, len(training_history[model_type])]
+    if signature == shown_signature:
+        return no_update, no_update, no_update
+    
+    started = time.perf_counter()
+    status = html.Div([
+        html.P("Model Status:", style={'fontWeight': '600', 'color': '#333', 'marginBottom': '10px'}),
+        html.P("Small Model: " + ("✓ Trained" if small_trained else "✗ Not Trained"),
+              style={'color': '#28a745' if small_trained else '#dc3545', 'marginBottom': '5px'}),
+        html.P("Big Model: " + ("✓ Trained" if big_trained else "✗ Not Trained"),
+              style={'color': '#28a745' if big_trained else '#dc3545'})
+    ])
+    record_timing('status_build', started, 'Model status')
     
-    # Training history chart
-    history_fig = go.Figure()
-    if training_history[model_type]:
-        history_data = training_history[model_type]
-        history_fig.add_trace(go.Scatter(
-            x=list(range(len(history_data))),
-            y=[h['test_loss'] for h in history_data],
-            mode='lines+markers',
-            name='Test Loss',
-            line=dict(color='#0018A8', width=2),
-            marker=dict(size=8)
-        ))
-    else:
-        history_fig.add_annotation(
-            text="No training history yet. Train a model to see history.",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5, showarrow=False
-        )
-    history_fig.update_layout(
-        title=f"{model_type.upper()} Model Training History",
-        xaxis_title="Training Run",
-        yaxis_title="Test Loss",
-        height=350,
-        showlegend=True
-    )
+    # Only the numbers go to the browser, the figures are assembled clientside
+    started = time.perf_counter()
+    runs, losses = history_points(tuple(h['test_loss'] for h in training_history[model_type]))
+    charts = {'model_type': model_type, 'small_loss': small_loss, 'big_loss': big_loss,
+              'runs': runs, 'losses': losses}
+    record_timing('charts_build', started, 'Model chart data')
     
-    return perf_fig, history_fig
+    return status, charts, signature
 
+app.clientside_callback(
+    ClientsideFunction(namespace='dashboard', function_name='buildMlCharts'),
+    [Output('ml-performance-chart', 'figure'),
+     Output('ml-training-history', 'figure')],
+    Input('ml-charts-store', 'data')
+)
 
 if __name__ == '__main__':
-    app.run(debug=True, port=8080)
+    app.run(debug=True, port=8080, threaded=True)
@@ -0,0 +1,70 @@
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    dashboard: {
+        // KPI values from kpi-store, formatted like the former server-side f"€{value:,.0f}"
+        formatKpis: function(kpis) {
+            if (!kpis) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            const euro = function(value) {
+                return '€' + Math.round(value || 0).toLocaleString('de-DE');
+            };
+            return [euro(kpis.total), String(kpis.regions), String(kpis.divisions), euro(kpis.avg)];
+        },
+
+        // ML performance and training history figures from ml-charts-store
+        buildMlCharts: function(charts) {
+            if (!charts) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            const trained = function(loss) {
+                return loss !== null && loss !== undefined;
+            };
+            const perfFig = {
+                data: [{
+                    type: 'bar',
+                    x: ['Small Model', 'Big Model'],
+                    y: [charts.small_loss || 0, charts.big_loss || 0],
+                    marker: {color: [trained(charts.small_loss) ? '#0018A8' : '#ccc',
+                                     trained(charts.big_loss) ? '#00BFFF' : '#ccc']},
+                    text: [trained(charts.small_loss) ? charts.small_loss.toFixed(4) : 'Not Trained',
+                           trained(charts.big_loss) ? charts.big_loss.toFixed(4) : 'Not Trained'],
+                    textposition: 'auto'
+                }],
+                layout: {
+                    title: {text: 'Model Performance (Test Loss)'},
+                    xaxis: {title: {text: 'Model'}},
+                    yaxis: {title: {text: 'Test Loss'}},
+                    height: 300,
+                    showlegend: false
+                }
+            };
+            const historyLayout = {
+                title: {text: charts.model_type.toUpperCase() + ' Model Training History'},
+                xaxis: {title: {text: 'Training Run'}},
+                yaxis: {title: {text: 'Test Loss'}},
+                height: 350,
+                showlegend: true
+            };
+            const historyData = [];
+            if (charts.losses.length) {
+                // WebGL keeps long histories responsive
+                historyData.push({
+                    type: 'scattergl',
+                    x: charts.runs,
+                    y: charts.losses,
+                    mode: 'lines+markers',
+                    name: 'Test Loss',
+                    line: {color: '#0018A8', width: 2},
+                    marker: {size: 8}
+                });
+            } else {
+                historyLayout.annotations = [{
+                    text: 'No training history yet. Train a model to see history.',
+                    xref: 'paper', yref: 'paper',
+                    x: 0.5, y: 0.5, showarrow: false
+                }];
+            }
+            return [perfFig, {data: historyData, layout: historyLayout}];
+        }
+    }
+});
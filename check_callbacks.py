@@ -2,66 +2,93 @@
 """
 Script to check for duplicate callback outputs in Dash app
 """
-import re
+import ast
 import sys
+from collections import defaultdict
 
-def find_duplicate_outputs(file_path):
-    """Find duplicate Output IDs in callbacks"""
-    with open(file_path, 'r') as f:
-        content = f.read()
-        lines = content.split('\n')
-    
-    # Find all @app.callback decorators with their line numbers
-    callback_pattern = r'@app\.callback\s*\((.*?)\)'
-    callbacks = []
-    
-    for match in re.finditer(callback_pattern, content, re.DOTALL):
-        start_pos = match.start()
-        line_num = content[:start_pos].count('\n') + 1
-        callback_content = match.group(1)
-        callbacks.append((line_num, callback_content))
+def is_app_callback(decorator):
+    """True for an @app.callback(...) decorator"""
+    return (isinstance(decorator, ast.Call)
+            and isinstance(decorator.func, ast.Attribute)
+            and decorator.func.attr == 'callback'
+            and isinstance(decorator.func.value, ast.Name)
+            and decorator.func.value.id == 'app')
+
+def is_output_call(node):
+    """True for an Output(...) or dash.Output(...) call"""
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    return (isinstance(func, ast.Name) and func.id == 'Output') or (isinstance(func, ast.Attribute) and func.attr == 'Output')
+
+def collect_outputs(tree):
+    """Map each Output ID in the parsed module to the callbacks that declare it"""
+    # All @app.callback decorators in source order, numbered like they appear in the file
+    decorators = sorted((decorator for node in ast.walk(tree)
+                         if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+                         for decorator in node.decorator_list if is_app_callback(decorator)),
+                        key=lambda decorator: (decorator.lineno, decorator.col_offset))
     
-    all_outputs = {}
+    all_outputs = defaultdict(list)
     
-    for callback_num, (line_num, callback_content) in enumerate(callbacks, 1):
-        # Find all Output() calls - handle both single and multi-line
-        output_pattern = r"Output\(['\"]([^'\"]+)['\"][^)]*\)"
-        outputs = re.findall(output_pattern, callback_content)
-        
-        # Also check for allow_duplicate
-        for output_match in re.finditer(output_pattern, callback_content):
-            output_id = output_match.group(1)
-            output_full = output_match.group(0)
-            has_allow_duplicate = 'allow_duplicate=True' in output_full
+    for callback_num, decorator in enumerate(decorators, 1):
+        # Output() calls anywhere in the decorator arguments, single or in a list
+        for output_call in ast.walk(decorator):
+            if not is_output_call(output_call) or not output_call.args:
+                continue
+            component_id = output_call.args[0]
+            if not (isinstance(component_id, ast.Constant) and isinstance(component_id.value, str)):
+                continue
             
-            if output_id not in all_outputs:
-                all_outputs[output_id] = []
-            all_outputs[output_id].append({
+            all_outputs[component_id.value].append({
                 'callback': callback_num,
-                'line': line_num,
-                'has_allow_duplicate': has_allow_duplicate
+                'line': decorator.lineno,
+                'call': output_call
             })
+    return all_outputs
+
+def has_allow_duplicate(output_call):
+    """True if the Output() call passes allow_duplicate=True"""
+    return any(keyword.arg == 'allow_duplicate'
+               and isinstance(keyword.value, ast.Constant) and keyword.value.value is True
+               for keyword in output_call.keywords)
+
+def find_duplicate_outputs(file_path):
+    """Find duplicate Output IDs in callbacks"""
+    # One parse of the file; the decorators and their Output() calls are read off the AST
+    with open(file_path, 'rb') as f:
+        tree = ast.parse(f.read(), filename=file_path)
+    all_outputs = collect_outputs(tree)
     
     # Find duplicates
     duplicates = {k: v for k, v in all_outputs.items() if len(v) > 1}
     
-    if duplicates:
-        print("❌ DUPLICATE CALLBACK OUTPUTS FOUND:")
-        print("=" * 70)
-        for output_id, occurrences in duplicates.items():
-            print(f"\nOutput ID: '{output_id}'")
-            print(f"  Found in {len(occurrences)} callbacks:")
+    # allow_duplicate is only checked for IDs that turn out to be duplicated
+    for occurrences in duplicates.values():
+        for occ in occurrences:
+            occ['has_allow_duplicate'] = has_allow_duplicate(occ['call'])
+    
+    # Dash needs allow_duplicate=True on every registration but one, the primary output
+    conflicts = {k: v for k, v in duplicates.items()
+                 if sum(not occ['has_allow_duplicate'] for occ in v) > 1}
+    
+    if conflicts:
+        # The report is collected and written in one go
+        out = ["❌ DUPLICATE CALLBACK OUTPUTS FOUND:", "=" * 70]
+        for output_id, occurrences in conflicts.items():
+            out.append(f"\nOutput ID: '{output_id}'")
+            out.append(f"  Found in {len(occurrences)} callbacks:")
             for occ in occurrences:
                 status = "✓" if occ['has_allow_duplicate'] else "✗"
-                print(f"    {status} Callback #{occ['callback']} at line {occ['line']} "
-                      f"{'(has allow_duplicate=True)' if occ['has_allow_duplicate'] else '(MISSING allow_duplicate=True)'}")
-            
-            # Check if all have allow_duplicate
-            all_have_allow_duplicate = all(occ['has_allow_duplicate'] for occ in occurrences)
-            if not all_have_allow_duplicate:
-                print(f"  ⚠️  WARNING: Not all occurrences have allow_duplicate=True!")
-        print("\n" + "=" * 70)
+                out.append(f"    {status} Callback #{occ['callback']} at line {occ['line']} "
+                           f"{'(has allow_duplicate=True)' if occ['has_allow_duplicate'] else '(MISSING allow_duplicate=True)'}")
+            out.append("  ⚠️  WARNING: Only one occurrence may omit allow_duplicate=True!")
+        out.append("\n" + "=" * 70)
+        sys.stdout.write('\n'.join(out) + '\n')
         return False
+    elif duplicates:
+        print(f"✓ No conflicting callback outputs found ({len(duplicates)} outputs shared via allow_duplicate=True)")
+        return True
     else:
         print("✓ No duplicate callback outputs found!")
         return True
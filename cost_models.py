@@ -0,0 +1,199 @@
+"""
+PyTorch cost prediction models. Imported lazily by app.py so that torch is only
+loaded once a model is trained or restored from disk.
+"""
+import logging
+import os
+import threading
+import torch
+import torch.nn as nn
+from safetensors.torch import save_file, load_file
+
+logger = logging.getLogger(__name__)
+
+# Training device
+DEVICE = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+
+# Let the CPU GEMM kernels use every core for the single forward/backward pass;
+# the interop pool is pinned to one thread since there are no parallel ops to overlap
+torch.set_num_threads(os.cpu_count() or 1)
+try:
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    # Only settable before the first inter-op parallel work has started
+    pass
+
+# Width of the learned vector per hierarchy level
+EMBEDDING_DIM = 4
+
+class LevelEmbedding(nn.Module):
+    """Embeds the integer code of every hierarchy level and concatenates the vectors.
+    
+    Levels are unordered categories, so each gets its own lookup table instead of
+    being fed to the network as an ordinal number.
+    """
+    def __init__(self, vocab_sizes, dim=EMBEDDING_DIM):
+        super(LevelEmbedding, self).__init__()
+        self.embs = nn.ModuleList([nn.Embedding(size, dim) for size in vocab_sizes])
+        self.out_features = len(vocab_sizes) * dim
+    
+    def forward(self, codes):
+        # Codes arrive as compact int8/int16, embedding lookups need int64
+        codes = codes.long()
+        parts = []
+        for i, emb in enumerate(self.embs):
+            parts.append(emb(codes[:, i]))
+        return torch.cat(parts, dim=1)
+
+# PyTorch Neural Network Models
+class SmallCostPredictor(nn.Module):
+    """Small neural network for cost prediction"""
+    def __init__(self, vocab_sizes):
+        super(SmallCostPredictor, self).__init__()
+        self.embed = LevelEmbedding(vocab_sizes)
+        self.fc1 = nn.Linear(self.embed.out_features, 32)
+        self.fc2 = nn.Linear(32, 16)
+        self.fc3 = nn.Linear(16, 1)
+        self.relu = nn.ReLU()
+        self.dropout = nn.Dropout(0.2)
+        
+    def forward(self, x):
+        x = self.embed(x)
+        x = self.relu(self.fc1(x))
+        x = self.dropout(x)
+        x = self.relu(self.fc2(x))
+        x = self.fc3(x)
+        return x
+    
+    def to_inference(self):
+        """Dropout-free forward path sharing the trained layers"""
+        return nn.Sequential(self.embed, self.fc1, nn.ReLU(), self.fc2, nn.ReLU(), self.fc3).eval()
+
+class BigCostPredictor(nn.Module):
+    """Large neural network for cost prediction"""
+    def __init__(self, vocab_sizes):
+        super(BigCostPredictor, self).__init__()
+        self.embed = LevelEmbedding(vocab_sizes)
+        self.fc1 = nn.Linear(self.embed.out_features, 128)
+        self.fc2 = nn.Linear(128, 64)
+        self.fc3 = nn.Linear(64, 32)
+        self.fc4 = nn.Linear(32, 16)
+        self.fc5 = nn.Linear(16, 1)
+        self.relu = nn.ReLU()
+        self.dropout = nn.Dropout(0.3)
+        
+    def forward(self, x):
+        x = self.embed(x)
+        x = self.relu(self.fc1(x))
+        x = self.dropout(x)
+        x = self.relu(self.fc2(x))
+        x = self.dropout(x)
+        x = self.relu(self.fc3(x))
+        x = self.dropout(x)
+        x = self.relu(self.fc4(x))
+        x = self.fc5(x)
+        return x
+    
+    def to_inference(self):
+        """Dropout-free forward path sharing the trained layers"""
+        return nn.Sequential(self.embed, self.fc1, nn.ReLU(), self.fc2, nn.ReLU(), self.fc3, nn.ReLU(),
+                             self.fc4, nn.ReLU(), self.fc5).eval()
+
+def create_model(model_type, vocab_sizes):
+    """Instantiate the network for the given model type and per-level vocabulary sizes"""
+    if model_type == 'small':
+        return SmallCostPredictor(vocab_sizes)
+    return BigCostPredictor(vocab_sizes)
+
+def compile_for_training(model, example):
+    """torch.compile the training forward pass; CUDA graphs ("reduce-overhead") only pay off on the GPU.
+    
+    The compiled module shares its parameters with model, so the optimizer keeps
+    working on the original module. Compilation is lazy, so one forward/backward
+    pass on example runs here; if the backend is unavailable (no inductor or C++
+    toolchain, unsupported platform) the eager model is returned instead.
+    """
+    mode = 'reduce-overhead' if DEVICE.type == 'cuda' else 'default'
+    try:
+        compiled = torch.compile(model, mode=mode, fullgraph=True)
+        compiled(example).sum().backward()
+    except Exception:
+        # Also catches genuine model errors, so the traceback is kept in the log
+        logger.warning("torch.compile unavailable, training eagerly", exc_info=True)
+        return model
+    finally:
+        model.zero_grad(set_to_none=True)
+    return compiled
+
+# training_module entries per architecture, created under TRAINING_MODULES_LOCK
+TRAINING_MODULES = {}
+TRAINING_MODULES_LOCK = threading.Lock()
+
+def training_module(model_type, vocab_sizes, batch_size, code_dtype):
+    """Network, compiled training forward and lock shared by all training runs of one architecture.
+    
+    Compiling once per architecture spares later runs the compile cost; each run
+    resets the parameters under the lock and copies the trained network out.
+    Concurrent first calls wait for a single compile instead of each building one.
+    """
+    key = (model_type, vocab_sizes, batch_size, code_dtype)
+    with TRAINING_MODULES_LOCK:
+        if key not in TRAINING_MODULES:
+            model = create_model(model_type, vocab_sizes).to(DEVICE)
+            example = torch.zeros((batch_size, len(vocab_sizes)), dtype=code_dtype, device=DEVICE)
+            TRAINING_MODULES[key] = (model, compile_for_training(model, example), threading.Lock())
+        return TRAINING_MODULES[key]
+
+def reset_parameters(model):
+    """Re-initialize every layer of model in place, as a freshly created network"""
+    for module in model.modules():
+        if module is not model and hasattr(module, 'reset_parameters'):
+            module.reset_parameters()
+
+def fused_epochs(model, criterion, optimizer, X, y, batch_size, epochs):
+    """Run a block of shuffled mini-batch epochs and return each epoch's last batch loss as a device tensor.
+    
+    X and y must already live on DEVICE. The permutation is drawn there and the
+    batches are gathered there, and the losses are not read, so the whole block
+    is queued without a host synchronization; the caller reads it back once.
+    """
+    if epochs < 1:
+        raise ValueError(f"epochs must be at least 1, got {epochs}")
+    losses = []
+    for _ in range(epochs):
+        # Fresh shuffle per epoch, batches are gathered through the permutation
+        perm = torch.randperm(len(X), device=X.device)
+        for start in range(0, len(X), batch_size):
+            idx = perm[start:start + batch_size]
+            optimizer.zero_grad()
+            loss = criterion(model(X[idx]), y[idx])
+            loss.backward()
+            optimizer.step()
+        losses.append(loss.detach())
+    return torch.stack(losses)
+
+def build_inference_model(model):
+    """Dropout-free embedding + Linear/ReLU chain with int8 dynamic quantized Linear weights, scripted and frozen"""
+    # Quantized kernels run on the CPU
+    quantized = torch.ao.quantization.quantize_dynamic(model.cpu().to_inference(), {nn.Linear}, dtype=torch.qint8)
+    return torch.jit.optimize_for_inference(torch.jit.script(quantized))
+
+def build_predictor(model):
+    """Inference forward built once per trained model: int64 level codes in, scaled predictions out"""
+    inference_model = build_inference_model(model)
+    
+    @torch.inference_mode()
+    def predict(codes):
+        return inference_model(torch.from_numpy(codes)).numpy()
+    
+    return predict
+
+def save_weights(model, path):
+    """Save the float weights of a trained model as safetensors"""
+    save_file(model.cpu().state_dict(), path)
+
+def load_model(model_type, vocab_sizes, path):
+    """Restore a trained model; safetensors memory-maps the weights instead of unpickling them"""
+    model = create_model(model_type, vocab_sizes)
+    model.load_state_dict(load_file(path, device='cpu'))
+    return model.eval()
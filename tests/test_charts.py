@@ -0,0 +1,18 @@
+import pandas as pd
+
+import app
+
+
+def test_sunburst_colors_parents_by_weighted_mean_cost():
+    index = pd.MultiIndex.from_tuples([('Europe', 'Germany', 'IT', 'Cloud'), ('Europe', 'France', 'IT', 'Cloud')],
+                                      names=app.CATEGORY_COLUMNS)
+    by_path = pd.Series([30, 10], index=index)
+    # Germany's path aggregates two rows of 10 and 20
+    squares_by_path = pd.Series([10 ** 2 + 20 ** 2, 10 ** 2], index=index)
+    
+    trace = app.create_sunburst(by_path, squares_by_path).data[0]
+    colors = dict(zip(trace.ids, trace.marker.colors))
+    
+    assert colors['Europe/Germany/IT/Cloud'] == 500 / 30
+    assert colors['Europe'] == 600 / 40
+    assert dict(zip(trace.ids, trace.values))['Europe'] == 40
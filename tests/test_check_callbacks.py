@@ -0,0 +1,36 @@
+import os
+
+import check_callbacks
+
+CALLBACKS = '''
+@app.callback(Output('a', 'children'), Input('x', 'value'))
+def primary(x): pass
+
+@app.callback(Output('a', 'children', allow_duplicate=True), Input('y', 'value'), prevent_initial_call=True)
+def secondary(y): pass
+'''
+
+
+def test_primary_output_without_allow_duplicate_passes(tmp_path, capsys):
+    path = tmp_path / 'callbacks.py'
+    path.write_text(CALLBACKS)
+    assert check_callbacks.find_duplicate_outputs(str(path))
+    assert '1 outputs shared via allow_duplicate=True' in capsys.readouterr().out
+
+
+def test_unique_outputs_report_no_duplicates(tmp_path, capsys):
+    path = tmp_path / 'callbacks.py'
+    path.write_text(CALLBACKS.replace("Output('a', 'children', allow_duplicate=True)", "Output('b', 'children')"))
+    assert check_callbacks.find_duplicate_outputs(str(path))
+    assert 'No duplicate callback outputs found' in capsys.readouterr().out
+
+
+def test_second_output_without_allow_duplicate_fails(tmp_path):
+    path = tmp_path / 'callbacks.py'
+    path.write_text(CALLBACKS.replace(', allow_duplicate=True', ''))
+    assert not check_callbacks.find_duplicate_outputs(str(path))
+
+
+def test_app_has_no_conflicting_outputs():
+    app_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+    assert check_callbacks.find_duplicate_outputs(app_path)
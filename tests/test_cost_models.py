@@ -0,0 +1,52 @@
+import pytest
+import torch
+from torch import nn
+
+import cost_models
+from cost_models import fused_epochs
+
+
+def test_fused_epochs_rejects_empty_block():
+    model = nn.Linear(2, 1)
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+    with pytest.raises(ValueError):
+        fused_epochs(model, nn.MSELoss(), optimizer, torch.zeros(4, 2), torch.zeros(4, 1), 2, 0)
+
+
+def test_fused_epochs_returns_one_loss_per_epoch():
+    model = nn.Linear(2, 1)
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+    losses = fused_epochs(model, nn.MSELoss(), optimizer, torch.randn(5, 2), torch.randn(5, 1), 2, 3)
+    assert losses.shape == (3,)
+    assert not losses.requires_grad
+
+
+def test_compile_failure_falls_back_to_eager_and_logs_traceback(monkeypatch, caplog):
+    def broken_compile(*args, **kwargs):
+        raise RuntimeError('no inductor')
+    monkeypatch.setattr(torch, 'compile', broken_compile)
+    model = nn.Linear(2, 1)
+    
+    assert cost_models.compile_for_training(model, torch.zeros(4, 2)) is model
+    assert caplog.records[-1].exc_info[1].args == ('no inductor',)
+    assert model.weight.grad is None
+
+
+def test_training_module_is_shared_per_architecture(monkeypatch):
+    monkeypatch.setattr(cost_models, 'compile_for_training', lambda model, example: model)
+    monkeypatch.setattr(cost_models, 'TRAINING_MODULES', {})
+    first = cost_models.training_module('small', (3, 4, 5, 6), 8, torch.int8)
+    assert cost_models.training_module('small', (3, 4, 5, 6), 8, torch.int8) is first
+    assert cost_models.training_module('big', (3, 4, 5, 6), 8, torch.int8)[0] is not first[0]
+
+
+@pytest.mark.parametrize('model_type', ['small', 'big'])
+def test_embedding_models_take_compact_level_codes(model_type):
+    vocab_sizes = (3, 4, 5, 6)
+    model = cost_models.create_model(model_type, vocab_sizes).eval()
+    codes = torch.tensor([[0, 1, 2, 3], [2, 3, 4, 5]], dtype=torch.int8)
+    
+    with torch.no_grad():
+        output = model(codes)
+        assert output.shape == (2, 1)
+        torch.testing.assert_close(model.to_inference()(codes), output)
@@ -0,0 +1,33 @@
+import app
+
+
+def test_stale_cascading_filter_returns_empty_slice():
+    # Germany is left selected in Level3 after switching Level2 from Europe to Asia
+    assert app.get_slice(('Asia',), ('Germany',)).empty
+    assert app.get_slice(('Asia', 'Europe'), ('Germany',))['Level3'].eq('Germany').all()
+
+
+def test_stale_cascading_filter_still_refreshes_options():
+    level3_options, _, level5_options = app.update_filter_options(['Asia'], ['Germany'], 'ALL')
+    level3_values = [option['value'] for option in level3_options]
+    assert 'Japan' in level3_values
+    assert 'Germany' not in level3_values
+    assert level5_options == [{'label': 'Alle', 'value': 'ALL'}]
+
+
+def test_stale_cascading_filter_aggregates_to_empty_charts():
+    filters = app.update_filter_store(['Asia'], ['Germany'], 'ALL', 'ALL')
+    assert filters == [('Asia',), ('Germany',), None, None]
+    assert list(app.aggregate_slice(*filters)['box_stats'].columns[:3]) == ['q1', 'median', 'q3']
+    assert app.update_kpis(filters) == {'total': 0, 'regions': 0, 'divisions': 0, 'avg': 0.0}
+    assert app.update_box_plot(filters)['data']
+
+
+def test_compute_kpis_matches_the_filtered_slice():
+    df_filtered = app.get_slice(('Europe',), None, None, None)
+    kpis = app.compute_kpis(df_filtered)
+    assert kpis['total'] == df_filtered['Cost'].sum()
+    assert kpis['avg'] == df_filtered['Cost'].mean()
+    assert kpis['count'] == len(df_filtered)
+    assert kpis['regions'] == 1
+    assert kpis['divisions'] == df_filtered['Level4'].nunique()
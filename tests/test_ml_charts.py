@@ -0,0 +1,42 @@
+import numpy as np
+
+import app
+
+
+def test_ml_charts_update_outside_a_request(monkeypatch):
+    monkeypatch.setattr(app, 'is_trained', lambda model_type: False)
+    status, charts, signature = app.update_ml_charts('small', None)
+    assert charts['model_type'] == 'small'
+    assert signature[0] == 'small'
+
+
+def test_lttb_keeps_endpoints_and_target_length():
+    x = np.arange(10_000, dtype=np.float64)
+    y = np.sin(x / 50)
+    y[4321] = 5.0
+    
+    x_out, y_out = app.lttb(x, y, 100)
+    
+    assert len(x_out) == len(y_out) == 100
+    assert (x_out[0], x_out[-1]) == (0, 9999)
+    assert np.all(np.diff(x_out) > 0)
+    # A spike is the largest triangle of its bucket
+    assert 4321 in x_out
+
+
+def test_ml_charts_skip_an_unchanged_signature(monkeypatch):
+    monkeypatch.setattr(app, 'is_trained', lambda model_type: False)
+    _, _, signature = app.update_ml_charts('big', None)
+    assert app.update_ml_charts('big', signature) == (app.no_update,) * 3
+    assert app.update_ml_charts('small', signature)[2] != signature
+
+
+def test_ml_charts_payload_carries_only_the_plotted_numbers(monkeypatch):
+    monkeypatch.setattr(app, 'is_trained', lambda model_type: model_type == 'small')
+    monkeypatch.setitem(app.training_history, 'small', [{'test_loss': 0.5}, {'test_loss': 0.25}])
+    monkeypatch.setitem(app.training_history, 'big', [{'test_loss': 0.75}])
+    
+    _, charts, _ = app.update_ml_charts('small', None)
+    
+    assert charts == {'model_type': 'small', 'small_loss': 0.25, 'big_loss': None,
+                      'runs': [0, 1], 'losses': [0.5, 0.25]}
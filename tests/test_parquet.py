@@ -0,0 +1,15 @@
+import os
+import stat
+
+import app
+
+
+def test_parquet_copy_gets_default_file_permissions(tmp_path):
+    source = tmp_path / 'costs.csv'
+    app.df.head(50).to_csv(source, index=False, columns=list(app.CSV_DTYPES))
+    target = tmp_path / 'costs.parquet'
+    
+    app.convert_csv_to_parquet(str(source), str(target))
+    
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o666 & ~app.UMASK
+    assert sorted(os.listdir(tmp_path)) == ['costs.csv', 'costs.parquet']
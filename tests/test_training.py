@@ -0,0 +1,42 @@
+import numpy as np
+
+import app
+
+
+def test_training_features_are_sorted_label_codes():
+    X, y_scaled, vocab_sizes, scaler_y, encoders = app.prepare_data_for_training()
+    
+    assert np.issubdtype(X.dtype, np.integer)
+    assert X.shape == (len(app.df), len(app.CATEGORY_COLUMNS))
+    for i, col in enumerate(app.CATEGORY_COLUMNS):
+        labels = sorted(app.df[col].unique())
+        assert encoders[col] == {label: idx for idx, label in enumerate(labels)}
+        assert vocab_sizes[i] == len(labels)
+        assert [labels[code] for code in X[:, i]] == app.df[col].tolist()
+    np.testing.assert_allclose(y_scaled / scaler_y[1] + scaler_y[0], app.df[['Cost']].to_numpy(), rtol=1e-5)
+
+
+def test_predict_cost_inverts_the_target_scaling_after_a_small_fit(tmp_path, monkeypatch):
+    import cost_models
+    monkeypatch.setattr(cost_models, 'compile_for_training', lambda model, example: model)
+    monkeypatch.setattr(cost_models, 'TRAINING_MODULES', {})
+    monkeypatch.setattr(app, 'MODELS_DIR', str(tmp_path))
+    monkeypatch.setitem(app.trained_models, 'small', dict(app.trained_models['small'], trained=False, fit=None))
+    row = app.df.iloc[0]
+    levels = [row[col] for col in app.CATEGORY_COLUMNS]
+    
+    success, train_loss, test_loss = app.train_model('small', epochs=2, learning_rate=0.01)
+    assert success, train_loss
+    prediction, error = app.predict_cost('small', *levels)
+    
+    # The predictor's raw output is in scaled units, predict_cost reports it in cost units
+    entry = app.trained_models['small']
+    mean, inv_scale = entry['scaler']
+    codes = np.array([[entry['encoders'][col][label] for col, label in zip(app.CATEGORY_COLUMNS, levels)]])
+    raw = float(entry['model'](codes)[0][0])
+    assert error is None
+    assert prediction == max(0, raw / inv_scale[0] + mean[0])
+    
+    # The checkpoint restores the same scaling
+    monkeypatch.setitem(app.trained_models, 'small', dict(entry, trained=False, model=None, scaler=None))
+    assert app.predict_cost('small', *levels) == (prediction, None)
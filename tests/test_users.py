@@ -0,0 +1,78 @@
+import orjson
+import pytest
+
+import app
+
+
+def test_corrupted_users_file_skips_and_repairs_records(tmp_path, monkeypatch):
+    users_file = tmp_path / 'users.json'
+    users_file.write_bytes(orjson.dumps({
+        'valid': {'password': app.hash_password('secret'), 'created_at': '2025-12-09T22:40:10'},
+        'bad_date': {'password': app.hash_password('secret'), 'created_at': 'yesterday'},
+        'no_date': {'password': app.hash_password('secret')},
+        'null_date': {'password': app.hash_password('secret'), 'created_at': None},
+        'no_password': {'email': 'nobody@example.com'},
+        'not_a_record': 'garbage'
+    }))
+    monkeypatch.setattr(app, 'USERS_FILE', str(users_file))
+    
+    with pytest.warns(UserWarning, match='no_password, not_a_record'):
+        users, unusable_users = app.load_users()
+    
+    assert set(users) == {'valid', 'bad_date', 'no_date', 'null_date'}
+    assert unusable_users == {'no_password': {'email': 'nobody@example.com'}, 'not_a_record': 'garbage'}
+    assert users['valid']['created_at_display'] == 'December 2025'
+    assert 'created_at_display' not in users['bad_date']
+    assert app.verify_password('secret', users['bad_date']['password'])
+
+
+def test_corrupted_users_file_still_allows_login(tmp_path, monkeypatch):
+    users_file = tmp_path / 'users.json'
+    users_file.write_bytes(orjson.dumps({
+        'user': {'password': app.hash_password('user123'), 'created_at': 'not a date'}
+    }))
+    monkeypatch.setattr(app, 'USERS_FILE', str(users_file))
+    monkeypatch.setattr(app, 'USERS', {})
+    monkeypatch.setattr(app, 'UNUSABLE_USERS', {})
+    monkeypatch.setattr(app, 'USERS_MTIME', None)
+    
+    session, message, pathname = app.login(1, 'user', 'user123', {'username': None, 'authenticated': False})
+    
+    assert session == {'username': 'user', 'authenticated': True}
+    assert pathname == '/dashboard'
+    app.create_profile_page('user')
+
+
+def test_saving_users_keeps_unusable_records(tmp_path, monkeypatch):
+    users_file = tmp_path / 'users.json'
+    users_file.write_bytes(orjson.dumps({
+        'user': {'password': app.hash_password('user123')},
+        'no_password': {'email': 'nobody@example.com'}
+    }))
+    monkeypatch.setattr(app, 'USERS_FILE', str(users_file))
+    monkeypatch.setattr(app, 'USERS', {})
+    monkeypatch.setattr(app, 'UNUSABLE_USERS', {})
+    monkeypatch.setattr(app, 'USERS_MTIME', None)
+    
+    with pytest.warns(UserWarning):
+        app.current_users()['user']['full_name'] = 'Jane Doe'
+    app.save_users(app.USERS)
+    
+    saved = orjson.loads(users_file.read_bytes())
+    assert saved['no_password'] == {'email': 'nobody@example.com'}
+    assert saved['user']['full_name'] == 'Jane Doe'
+
+
+def test_unreadable_users_file_is_never_overwritten(tmp_path, monkeypatch):
+    users_file = tmp_path / 'users.json'
+    users_file.write_bytes(b'{"admin": {"password": "\x00')
+    monkeypatch.setattr(app, 'USERS_FILE', str(users_file))
+    
+    with pytest.warns(UserWarning, match='not valid JSON'):
+        users, unusable_users = app.load_users()
+    assert users == {} and unusable_users is None
+    
+    monkeypatch.setattr(app, 'UNUSABLE_USERS', unusable_users)
+    with pytest.raises(RuntimeError):
+        app.save_users({'user': {'password': app.hash_password('user123')}})
+    assert users_file.read_bytes() == b'{"admin": {"password": "\x00'